@@ -0,0 +1,261 @@
+"""Offline benchmarks for generate_profile_assets.py.
+
+Builds synthetic RepoInfo/RepoCommitStat datasets and times each phase on
+its own: fetch_all_repositories against a local fake GraphQL endpoint, the
+SVG/Markdown renderers and the README update. Nothing touches the network.
+
+    python scripts/benchmark_profile_assets.py --sizes 10 1000 10000
+    python scripts/benchmark_profile_assets.py --compare .cache/benchmarks/<old>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime as dt
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+import generate_profile_assets as gpa
+
+RESULTS_DIR = gpa.CACHE_DIR / "benchmarks"
+DEFAULT_SIZES = (10, 1_000, 10_000, 100_000)
+LANGUAGES = ("Python", "TypeScript", "C#", "Go", "Rust", "JavaScript", None)
+
+
+def make_repos(count: int, owner: str = "bench", seed: int = 42) -> list[gpa.RepoInfo]:
+    rng = random.Random(seed)
+    start = dt.datetime(2015, 1, 1, tzinfo=dt.timezone.utc)
+    repos = []
+    for i in range(count):
+        pushed = start + dt.timedelta(seconds=rng.randrange(11 * 365 * 86400))
+        repos.append(
+            gpa.RepoInfo(
+                name_with_owner=f"{owner}/project-{i:06d}",
+                url=f"https://github.com/{owner}/project-{i:06d}",
+                stars=int(rng.paretovariate(1.2)) - 1,
+                primary_language=rng.choice(LANGUAGES),
+                pushed_at=pushed.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                total_commits=int(rng.paretovariate(0.8)),
+            )
+        )
+    repos.sort(key=lambda r: r.pushed_at or "", reverse=True)
+    return repos
+
+
+def make_commit_stats(repos: list[gpa.RepoInfo]) -> list[gpa.RepoCommitStat]:
+    stats = [gpa.RepoCommitStat(r.name_with_owner, r.url, r.total_commits) for r in repos if r.total_commits]
+    stats.sort(key=lambda s: s.commit_contributions, reverse=True)
+    return stats
+
+
+def _repo_node(repo: gpa.RepoInfo, with_history: bool = True) -> dict[str, Any]:
+    node: dict[str, Any] = {
+        "nameWithOwner": repo.name_with_owner,
+        "url": repo.url,
+        "stargazerCount": repo.stars,
+        "pushedAt": repo.pushed_at,
+        "primaryLanguage": {"name": repo.primary_language} if repo.primary_language else None,
+    }
+    if with_history:
+        node["defaultBranchRef"] = {"target": {"history": {"totalCount": repo.total_commits}}}
+    return node
+
+
+class FakeGraphQLServer:
+    """Local stand-in for api.github.com/graphql serving a synthetic dataset.
+
+    Repository pages are serialized up front so the server's own cost stays
+    out of the fetch measurement as much as possible.
+    """
+
+    def __init__(self, repos: list[gpa.RepoInfo], page_size: int = 100) -> None:
+        self.page_size = page_size
+        self.pages: dict[str, bytes] = {}
+        for start in range(0, max(len(repos), 1), page_size):
+            chunk = repos[start : start + page_size]
+            has_next = start + page_size < len(repos)
+            payload = {
+                "data": {
+                    "repositoryOwner": {
+                        "repositories": {
+                            "pageInfo": {"hasNextPage": has_next, "endCursor": str(start + page_size)},
+                            "nodes": [_repo_node(r) for r in chunk],
+                        }
+                    }
+                }
+            }
+            self.pages[str(start) if start else ""] = json.dumps(payload).encode("utf-8")
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                cursor = (body.get("variables") or {}).get("cursor") or ""
+                blob = server.pages.get(cursor, b'{"errors":[{"message":"unknown cursor"}]}')
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(blob)))
+                self.end_headers()
+                self.wfile.write(blob)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_port}/graphql"
+
+    def __enter__(self) -> FakeGraphQLServer:
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def _measure(fn: Callable[[], Any], track_memory: bool) -> tuple[float, int | None]:
+    """Wall time of fn and, optionally, its peak traced allocation in a second run"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+
+        peak = None
+        if track_memory:
+            tracemalloc.start()
+            try:
+                fn()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+    return elapsed, peak
+
+
+def run_size(size: int, workdir: Path, track_memory: bool) -> list[dict[str, Any]]:
+    repos = make_repos(size)
+    stats = make_commit_stats(repos)
+    readme = workdir / "README.md"
+    readme.write_text("# Bench\n\n<!-- REPOS-LIST:START -->\n<!-- REPOS-LIST:END -->\n", encoding="utf-8")
+
+    with FakeGraphQLServer(repos) as server:
+        def fetch() -> None:
+            with gpa.GraphQLTransport("benchmark", endpoint=server.url) as transport:
+                fetched = gpa.fetch_all_repositories(transport, "bench")
+            assert len(fetched) == size, f"fetched {len(fetched)} of {size} repos"
+
+        phases: list[tuple[str, Callable[[], Any]]] = [
+            ("fetch_all_repositories", fetch),
+            ("render_combined_repos_svg", lambda: gpa.render_combined_repos_svg("bench", repos, workdir / "overview.svg")),
+            ("render_commits_svg", lambda: gpa.render_commits_svg("bench", "bench", stats, workdir / "commits.svg")),
+            ("render_repos_markdown", lambda: gpa.render_repos_markdown("bench", repos, workdir / "repositories.md")),
+            ("update_readme_repo_section", lambda: gpa.update_readme_repo_section("bench", repos, readme_path=readme)),
+        ]
+
+        results = []
+        for phase, fn in phases:
+            elapsed, peak = _measure(fn, track_memory)
+            results.append(
+                {
+                    "size": size,
+                    "phase": phase,
+                    "seconds": round(elapsed, 6),
+                    "repos_per_second": round(size / elapsed, 1) if elapsed > 0 else None,
+                    "peak_bytes": peak,
+                }
+            )
+    return results
+
+
+def _git_revision() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=gpa.ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _fmt_bytes(value: int | None) -> str:
+    if value is None:
+        return "—"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return str(value)
+
+
+def compare(current: list[dict[str, Any]], baseline_path: Path) -> None:
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    previous = {(r["size"], r["phase"]): r for r in baseline["results"]}
+    print(f"\n📊 Compared with {baseline_path.name} ({baseline.get('revision') or 'unknown revision'})")
+    for row in current:
+        old = previous.get((row["size"], row["phase"]))
+        if not old or not old["seconds"]:
+            continue
+        ratio = row["seconds"] / old["seconds"]
+        flag = "  ⚠ slower" if ratio > 1.1 else ""
+        print(f"  {row['size']:>7} {row['phase']:<28} {old['seconds']:>9.4f}s → {row['seconds']:>9.4f}s  ×{ratio:.2f}{flag}")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark profile asset generation offline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc pass (faster).")
+    parser.add_argument("--output", type=Path, help="Results file (default: .cache/benchmarks/<timestamp>.json).")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against.")
+    args = parser.parse_args(argv)
+
+    print("⏱  Running offline benchmarks...")
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="profile-bench-") as tmp:
+        for size in args.sizes:
+            print(f"\n📦 {size} repositories")
+            for row in run_size(size, Path(tmp), track_memory=not args.no_memory):
+                results.append(row)
+                rate = f"{row['repos_per_second']:,.0f} repos/s" if row["repos_per_second"] else "—"
+                print(f"  {row['phase']:<28} {row['seconds']:>9.4f}s  {rate:>18}  peak {_fmt_bytes(row['peak_bytes'])}")
+
+    stamp = dt.datetime.now(dt.timezone.utc)
+    report = {
+        "created_at": stamp.isoformat(),
+        "revision": _git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or RESULTS_DIR / f"{stamp.strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"\n✓ Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""Local stand-in for api.github.com/graphql that serves recorded cassettes.
+
+Record a cassette with `generate_profile_assets.py --record cassette.json`,
+then point the generator (or the benchmarks) at this server:
+
+    python scripts/cassette_server.py cassette.json --latency-ms 120 --error-rate 0.05
+    GITHUB_GRAPHQL_URL=http://127.0.0.1:8787/graphql GITHUB_TOKEN=x \\
+        python scripts/generate_profile_assets.py --no-cache
+
+Latency and failures are injected per request, so the retry and pooling
+behaviour of GraphQLTransport can be load-tested without spending rate limit.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from generate_profile_assets import Cassette
+
+
+class CassetteServer:
+    def __init__(
+        self,
+        cassettes: list[Path],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0,
+        rate_limit_rate: float = 0,
+        seed: int | None = None,
+    ) -> None:
+        interactions: list[dict[str, Any]] = []
+        for path in cassettes:
+            interactions.extend(Cassette.load(path).interactions)
+        self.cassette = Cassette(interactions)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_POST(self) -> None:
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+                status, headers, blob = server.respond(body.get("query", ""), body.get("variables"))
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(blob)))
+                self.end_headers()
+                self.wfile.write(blob)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/graphql"
+
+    def respond(self, query: str, variables: dict[str, Any] | None) -> tuple[int, dict[str, str], bytes]:
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.rng.random()
+        time.sleep(delay)
+
+        if roll < self.error_rate:
+            return 502, {}, b'{"message":"Server Error"}'
+        if roll < self.error_rate + self.rate_limit_rate:
+            return 403, {"Retry-After": "1"}, b'{"message":"You have exceeded a secondary rate limit."}'
+
+        data = self.cassette.lookup(query, variables)
+        if data is None:
+            blob = json.dumps({"errors": [{"message": "No recorded response for this request"}]})
+            return 200, {}, blob.encode("utf-8")
+        return 200, {}, json.dumps({"data": data}).encode("utf-8")
+
+    def start(self) -> CassetteServer:
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> CassetteServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve recorded GraphQL cassettes over HTTP.")
+    parser.add_argument("cassettes", type=Path, nargs="+")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Mean added latency per request.")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Uniform +/- jitter around the latency.")
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with 502.")
+    parser.add_argument(
+        "--rate-limit-rate",
+        type=float,
+        default=0,
+        help="Fraction of requests answered with a 403 secondary rate limit.",
+    )
+    parser.add_argument("--seed", type=int, help="Seed for reproducible latency/error injection.")
+    args = parser.parse_args(argv)
+
+    server = CassetteServer(
+        args.cassettes,
+        host=args.host,
+        port=args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        seed=args.seed,
+    )
+    print(f"🎞  Serving {len(server.cassette.interactions)} recorded exchanges on {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,46 @@
 from __future__ import annotations
 
+import argparse
+import array
+import bisect
+import dataclasses
 import datetime as dt
+import hashlib
+import heapq
+import json
 import math
+import mmap
 import os
+import random
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence, TextIO
 
-import requests
+# requests, concurrent.futures, gzip and email.utils are imported where they
+# are used: `render` never touches the network and starts several times
+# faster without them.
+if TYPE_CHECKING:
+    import requests
 
 ROOT = Path(__file__).resolve().parents[1]
 OUT_DIR = ROOT / "generated"
+CACHE_DIR = ROOT / ".cache"
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RepoCommitStat:
     name_with_owner: str
     url: str
     commit_contributions: int
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RepoInfo:
     name_with_owner: str
     url: str
@@ -30,575 +50,4134 @@ class RepoInfo:
     total_commits: int
 
 
-def _require_env(name: str) -> str:
-    value = os.getenv(name)
-    if not value:
-        raise RuntimeError(f"Missing required env var: {name}")
-    return value
+class RepoTable:
+    """Column-oriented repository set consumed by the renderers.
 
+    Numeric columns are compact `array`s and string columns plain lists, so
+    a large account costs a handful of containers instead of one object per
+    repository. Filtering, ordering, top-N and bar scaling work on integer
+    row indices in single C-level passes (sorted/heapq keyed by
+    array.__getitem__) instead of building tuples per row.
+    """
 
-def _graphql(token: str, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json",
-    }
-    response = requests.post(
-        "https://api.github.com/graphql",
-        headers=headers,
-        json={"query": query, "variables": variables or {}},
-        timeout=30,
-    )
-    response.raise_for_status()
-    payload = response.json()
-    if payload.get("errors"):
-        raise RuntimeError(f"GraphQL errors: {payload['errors']}")
-    return payload["data"]
+    __slots__ = ("names", "urls", "stars", "languages", "pushed_at", "commits")
 
+    def __init__(self) -> None:
+        self.names: list[str] = []
+        self.urls: list[str] = []
+        self.stars = array.array("q")
+        self.languages: list[str | None] = []
+        self.pushed_at: list[str | None] = []
+        self.commits = array.array("q")
 
-def fetch_commit_contributions_by_repo(token: str, username: str, days: int = 365) -> list[RepoCommitStat]:
-    to_date = dt.datetime.now(dt.timezone.utc)
-    from_date = to_date - dt.timedelta(days=days)
+    @classmethod
+    def from_repos(cls, repos: Iterable[RepoInfo]) -> RepoTable:
+        table = cls()
+        table.extend(repos)
+        return table
 
-    query = """
-    query($login: String!, $from: DateTime!, $to: DateTime!) {
-      user(login: $login) {
-        contributionsCollection(from: $from, to: $to) {
-          commitContributionsByRepository(maxRepositories: 100) {
-            repository { nameWithOwner url }
-            contributions { totalCount }
-          }
-        }
-      }
-    }
-    """
+    @classmethod
+    def from_commit_stats(cls, stats: Iterable[RepoCommitStat]) -> RepoTable:
+        table = cls()
+        for s in stats:
+            table.names.append(s.name_with_owner)
+            table.urls.append(s.url)
+            table.stars.append(0)
+            table.languages.append(None)
+            table.pushed_at.append(None)
+            table.commits.append(s.commit_contributions)
+        return table
 
-    data = _graphql(
-        token,
-        query,
-        {
-            "login": username,
-            "from": from_date.isoformat(),
-            "to": to_date.isoformat(),
-        },
-    )
-
-    items = (
-        data.get("user", {})
-        .get("contributionsCollection", {})
-        .get("commitContributionsByRepository", [])
-    )
-
-    stats: list[RepoCommitStat] = []
-    for item in items:
-        repo = item.get("repository") or {}
-        contrib = item.get("contributions") or {}
-        total = int(contrib.get("totalCount") or 0)
-        if total <= 0:
-            continue
-        stats.append(
-            RepoCommitStat(
-                name_with_owner=str(repo.get("nameWithOwner")),
-                url=str(repo.get("url")),
-                commit_contributions=total,
-            )
+    @classmethod
+    def coerce(cls, repos: RepoTable | Iterable[RepoInfo]) -> RepoTable:
+        return repos if isinstance(repos, RepoTable) else cls.from_repos(repos)
+
+    def extend(self, repos: Iterable[RepoInfo]) -> None:
+        intern = sys.intern
+        for r in repos:
+            self.names.append(r.name_with_owner)
+            self.urls.append(r.url)
+            self.stars.append(r.stars)
+            # A few dozen languages repeat across every row; JSON loading
+            # would otherwise give each row its own copy of the string
+            self.languages.append(intern(r.primary_language) if r.primary_language else None)
+            self.pushed_at.append(r.pushed_at)
+            self.commits.append(r.total_commits)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def row(self, i: int) -> RepoInfo:
+        return RepoInfo(
+            name_with_owner=self.names[i],
+            url=self.urls[i],
+            stars=self.stars[i],
+            primary_language=self.languages[i],
+            pushed_at=self.pushed_at[i],
+            total_commits=self.commits[i],
         )
 
-    stats.sort(key=lambda s: s.commit_contributions, reverse=True)
-    return stats
+    def __iter__(self) -> Iterator[RepoInfo]:
+        return (self.row(i) for i in range(len(self.names)))
 
+    def without_owner_repo(self, login: str) -> list[int]:
+        """Row indices, minus any repository named like the login (the profile repo)"""
+        login = login.lower()
+        return [i for i, name in enumerate(self.names) if name.rsplit("/", 1)[-1].lower() != login]
 
-def fetch_all_repositories(token: str, username: str) -> list[RepoInfo]:
-    query = """
-    query($login: String!, $cursor: String) {
-      user(login: $login) {
-        repositories(
-          first: 100,
-          after: $cursor,
-          ownerAffiliations: OWNER,
-          privacy: PUBLIC,
-          orderBy: {field: PUSHED_AT, direction: DESC}
-        ) {
-          pageInfo { hasNextPage endCursor }
-          nodes {
-            nameWithOwner
-            url
-            stargazerCount
-            pushedAt
-            primaryLanguage { name }
-            defaultBranchRef {
-              target {
-                ... on Commit {
-                  history(first: 0) {
-                    totalCount
-                  }
-                }
-              }
-            }
-          }
-        }
-      }
-    }
-    """
+    def order_by_commits(self, indices: Iterable[int] | None = None) -> list[int]:
+        """Indices sorted by commits, descending; ties keep their input order"""
+        rows = range(len(self.names)) if indices is None else indices
+        return sorted(rows, key=self.commits.__getitem__, reverse=True)
 
-    repos: list[RepoInfo] = []
-    cursor: str | None = None
+    def top_by_commits(self, n: int, indices: Iterable[int] | None = None) -> list[int]:
+        rows = range(len(self.names)) if indices is None else indices
+        return heapq.nlargest(n, rows, key=self.commits.__getitem__)
 
-    while True:
-        data = _graphql(token, query, {"login": username, "cursor": cursor})
-        container = data.get("user", {}).get("repositories", {})
-        nodes = container.get("nodes", []) or []
+    def total_commits(self, indices: Iterable[int] | None = None) -> int:
+        if indices is None:
+            return sum(self.commits)
+        commits = self.commits
+        return sum(commits[i] for i in indices)
 
-        for node in nodes:
-            name = str(node.get("nameWithOwner"))
-            url = str(node.get("url"))
-            stars = int(node.get("stargazerCount") or 0)
-            pushed_at = node.get("pushedAt")
-            lang = (node.get("primaryLanguage") or {}).get("name")
-            
-            # Get total commits from default branch
-            total_commits = 0
-            default_branch = node.get("defaultBranchRef")
-            if default_branch:
-                target = default_branch.get("target") or {}
-                history = target.get("history") or {}
-                total_commits = int(history.get("totalCount") or 0)
-            
-            print(f"  → {name}: {total_commits} commits")
-            
-            repos.append(
-                RepoInfo(
-                    name_with_owner=name,
-                    url=url,
-                    stars=stars,
-                    primary_language=str(lang) if lang else None,
-                    pushed_at=str(pushed_at) if pushed_at else None,
-                    total_commits=total_commits,
-                )
-            )
+    def bar_widths(self, indices: Sequence[int], max_width: int, max_value: int) -> list[int]:
+        if max_value <= 0:
+            return [0] * len(indices)
+        commits = self.commits
+        # int() truncates, which equals floor for the non-negative counts here
+        return [int((commits[i] / max_value) * max_width) for i in indices]
 
-        page = container.get("pageInfo", {})
-        if not page.get("hasNextPage"):
-            break
-        cursor = page.get("endCursor")
 
-    return repos
+def _require_env(name: str) -> str:
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"Missing required env var: {name}")
+    return value
 
 
-def render_repo_card_svg(repo: RepoInfo, out_path: Path, index: int) -> None:
-    """Generate a beautiful SVG card for a single repository"""
-    width = 440
-    height = 140
-    
-    repo_name = repo.name_with_owner.split('/')[-1]
-    lang = repo.primary_language or "Other"
-    
-    # Language colors
-    lang_colors = {
-        "Python": "#3776AB", "JavaScript": "#F7DF1E", "TypeScript": "#3178C6",
-        "Java": "#007396", "C#": "#239120", "C++": "#00599C", "Go": "#00ADD8",
-        "Rust": "#000000", "Ruby": "#CC342D", "PHP": "#777BB4", "Swift": "#FA7343",
-        "Kotlin": "#7F52FF", "Dart": "#0175C2", "HTML": "#E34F26", "CSS": "#1572B6"
-    }
-    color = lang_colors.get(lang, "#8A2BE2")
-    
-    # Format date
-    try:
-        pushed = dt.datetime.fromisoformat(repo.pushed_at.replace("Z", "+00:00")).strftime("%d/%m/%Y") if repo.pushed_at else "—"
-    except:
-        pushed = "—"
-    
-    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
-  <defs>
-    <linearGradient id="grad{index}" x1="0%" y1="0%" x2="100%" y2="100%">
-      <stop offset="0%" style="stop-color:#667eea;stop-opacity:1" />
-      <stop offset="100%" style="stop-color:#764ba2;stop-opacity:1" />
-    </linearGradient>
-  </defs>
-  
-  <rect width="{width}" height="{height}" rx="10" fill="url(#grad{index})"/>
-  <rect x="8" y="8" width="{width-16}" height="{height-16}" rx="8" fill="#1a1b27" opacity="0.95"/>
-  
-  <g transform="translate(20, 25)">
-    <text x="0" y="0" fill="#c9d1d9" font-family="ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial" font-size="18" font-weight="700">
-      📦 {_escape_xml(repo_name)}
-    </text>
-    
-    <g transform="translate(0, 30)">
-      <rect x="0" y="0" width="100" height="24" rx="12" fill="{color}" opacity="0.2"/>
-      <circle cx="12" cy="12" r="5" fill="{color}"/>
-      <text x="22" y="16" fill="{color}" font-family="ui-sans-serif,system-ui" font-size="13" font-weight="600">{_escape_xml(lang)}</text>
-    </g>
-    
-    <g transform="translate(0, 65)">
-      <text x="0" y="0" fill="#8b949e" font-family="ui-sans-serif,system-ui" font-size="13">
-        ⭐ <tspan fill="#c9d1d9" font-weight="600">{repo.stars}</tspan>
-        <tspan dx="20">📅 {_escape_xml(pushed)}</tspan>
-      </text>
-    </g>
-  </g>
-</svg>'''
-    
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(svg, encoding="utf-8")
+class RepoAggregate:
+    """Single-pass summary of a repository stream: counts, totals and the top N by commits.
 
+    Only the current top `limit` repositories are held (a min-heap that the
+    next repository displaces the smallest of), so memory is O(limit)
+    however long the stream is. Ties keep their arrival order, as in
+    RepoTable.order_by_commits.
+    """
 
-def _escape_xml(text: str) -> str:
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&apos;")
-    )
+    __slots__ = ("limit", "count", "total_commits", "total_stars", "_heap", "_seq")
 
+    def __init__(self, limit: int = 15) -> None:
+        self.limit = limit
+        self.count = 0
+        self.total_commits = 0
+        self.total_stars = 0
+        self._heap: list[tuple[int, int, RepoInfo]] = []
+        self._seq = 0
 
-def render_combined_repos_svg(
-    username: str,
-    repos: list[RepoInfo],
-    out_path: Path,
-) -> None:
-    """Generate a beautiful combined SVG showing all repos with commits, stars, and dates"""
-    width = 900
-    padding = 24
-    row_h = 55
-    title_h = 55
-    
-    # Filter out the profile repo itself and use total_commits from RepoInfo
-    filtered = []
-    
-    for r in repos:
-        if r.name_with_owner.split('/')[-1].lower() != username.lower():
-            filtered.append((r, r.total_commits))
-    
-    # Sort by commits (descending)
-    filtered.sort(key=lambda x: x[1], reverse=True)
-    
-    if not filtered:
-        height = 200
-        bg = "#0d1117"
-        card = "#161b22"
-        text = "#c9d1d9"
-        muted = "#8b949e"
-        
-        parts = [
-            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">',
-            f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{bg}"/>',
-            f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{card}"/>',
-            f'<text x="{padding}" y="80" fill="{text}" font-family="ui-sans-serif,system-ui" font-size="18" font-weight="700">Nenhum repositório encontrado</text>',
-            "</svg>"
-        ]
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text("\n".join(parts), encoding="utf-8")
-        return
-    
-    height = padding * 2 + title_h + row_h * len(filtered) + 20
-    max_commits = max((c for _, c in filtered), default=1) or 1
-    
-    bg = "#0d1117"
-    card = "#161b22"
-    text = "#c9d1d9"
-    muted = "#8b949e"
-    bar = "#8A2BE2"
-    bar_secondary = "#a855f7"
-    bar_bg = "#21262d"
-    
-    def scale_bar(v: int, max_width: int = 280) -> int:
-        if max_commits == 0:
-            return 0
-        return int((v / max_commits) * max_width)
-    
-    def fmt_date(iso: str | None) -> str:
-        if not iso:
-            return "—"
-        try:
-            return dt.datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%d/%m/%y")
-        except:
-            return iso[:10] if iso else "—"
-    
-    parts = [
-        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">',
-        "<defs>",
-        '<linearGradient id="barGradient" x1="0%" y1="0%" x2="100%" y2="0%">',
-        f'  <stop offset="0%" style="stop-color:{bar};stop-opacity:1" />',
-        f'  <stop offset="100%" style="stop-color:{bar_secondary};stop-opacity:1" />',
-        '</linearGradient>',
-        "</defs>",
-        "<style>",
-        ".title{font:700 20px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
-        ".sub{font:500 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
-        ".repo-name{font:700 16px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
-        ".stat{font:600 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
-        "</style>",
-        f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{bg}"/>',
-        f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{card}"/>',
-    ]
-    
-    # Title
-    title = "Repositórios — Atividade e Stats"
-    subtitle = f"@{username} • {len(filtered)} repos com total de {sum(c for _, c in filtered)} commits"
-    parts.append(f'<text x="{padding}" y="{padding + 20}" class="title" fill="{text}">{_escape_xml(title)}</text>')
-    parts.append(f'<text x="{padding}" y="{padding + 42}" class="sub" fill="{muted}">{_escape_xml(subtitle)}</text>')
-    
-    start_y = padding + title_h + 15
-    
-    for i, (repo, commits) in enumerate(filtered):
-        y = start_y + i * row_h
-        repo_name = repo.name_with_owner.split('/')[-1]
-        display_name = repo_name if len(repo_name) <= 30 else repo_name[:27] + "..."
-        
-        pushed = fmt_date(repo.pushed_at)
-        
-        # Repo name (left) - MAIOR e mais DESTACADO
-        parts.append(f'<text x="{padding}" y="{y + 10}" class="repo-name" fill="{text}">📦 {_escape_xml(display_name)}</text>')
-        
-        # Commits bar (center)
-        bar_x = padding + 260
-        bar_y = y - 2
-        bar_width = scale_bar(commits, 280)
-        parts.append(f'<rect x="{bar_x}" y="{bar_y}" width="280" height="14" rx="7" fill="{bar_bg}"/>')
-        if bar_width > 0:
-            parts.append(f'<rect x="{bar_x}" y="{bar_y}" width="{bar_width}" height="14" rx="7" fill="url(#barGradient)"/>')
-        
-        # Stats (right side - below bar)
-        stats_y = y + 28
-        parts.append(f'<text x="{bar_x}" y="{stats_y}" class="stat" fill="{muted}">💬 {commits} commits</text>')
-        parts.append(f'<text x="{bar_x + 100}" y="{stats_y}" class="stat" fill="{muted}">⭐ {repo.stars}</text>')
-        parts.append(f'<text x="{bar_x + 170}" y="{stats_y}" class="stat" fill="{muted}">📅 {pushed}</text>')
-    
-    parts.append("</svg>")
-    
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text("\n".join(parts), encoding="utf-8")
-    print(f"  → Generated combined SVG with {len(filtered)} repositories")
-    print(f"  → File size: {out_path.stat().st_size} bytes")
+    def add(self, repo: RepoInfo) -> None:
+        self.count += 1
+        self.total_commits += repo.total_commits
+        self.total_stars += repo.stars
+        # Earlier repositories win ties, so later ones rank lower via -seq
+        item = (repo.total_commits, -self._seq, repo)
+        self._seq += 1
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+        elif item[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, item)
 
+    def consume(self, repos: Iterable[RepoInfo]) -> RepoAggregate:
+        for repo in repos:
+            self.add(repo)
+        return self
 
-def render_commits_svg(
-    username: str,
-    period_label: str,
-    stats: list[RepoCommitStat],
-    out_path: Path,
-    max_rows: int = 15,
-) -> None:
-    width = 900
-    padding = 24
-    row_h = 28
-    title_h = 42
-    bar_h = 10
+    def top(self) -> list[RepoInfo]:
+        return [repo for _, _, repo in sorted(self._heap, key=lambda item: item[:2], reverse=True)]
 
-    rows = stats[:max_rows]
-    
-    # If no stats, render a placeholder card
-    if not rows:
-        height = 180
-        bg = "#0b1020"
-        card = "#111827"
-        text = "#e5e7eb"
-        muted = "#9ca3af"
-        
-        parts = [
-            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">',
-            f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{bg}"/>',
-            f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{card}"/>',
-            f'<text x="{padding}" y="60" fill="{text}" font-family="ui-sans-serif,system-ui" font-size="18" font-weight="700">Commits por repositório — {_escape_xml(period_label)}</text>',
-            f'<text x="{padding}" y="90" fill="{muted}" font-family="ui-sans-serif,system-ui" font-size="14">Nenhum commit encontrado no período selecionado.</text>',
-            f'<text x="{padding}" y="120" fill="{muted}" font-family="ui-sans-serif,system-ui" font-size="13">Isso pode acontecer se este for seu primeiro run ou se não houver atividade recente.</text>',
-            "</svg>"
-        ]
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text("\n".join(parts), encoding="utf-8")
-        return
-    
-    max_value = max((r.commit_contributions for r in rows), default=1)
 
-    height = padding * 2 + title_h + row_h * len(rows) + 10
+class RunMetrics:
+    """Per-run instrumentation: phase timings, GraphQL traffic and rate-limit usage.
 
-    bg = "#0d1117"
-    card = "#161b22"
-    text = "#c9d1d9"
-    muted = "#8b949e"
-    bar = "#8A2BE2"
-    bar_secondary = "#a855f7"
-    bar_bg = "#21262d"
+    Shared through the transport, so every fetch and every batch worker
+    reports into the same collector. All mutation goes through one lock.
+    """
 
-    def scale(v: int) -> int:
-        bar_w_max = 420
-        return int(math.floor((v / max_value) * bar_w_max))
+    def __init__(self) -> None:
+        self.started_at = dt.datetime.now(dt.timezone.utc)
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases: dict[str, dict[str, float]] = {}
+        self.latencies: list[float] = []
+        self.by_operation: dict[str, int] = {}
+        self.statuses: dict[str, int] = {}
+        self.requests = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.pages_fetched = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.rate_limit_cost = 0
+        self.rate_limit_last: dict[str, Any] | None = None
+        self.rate_limit_min_remaining: int | None = None
 
-    parts: list[str] = []
-    parts.append(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">')
-    
-    # Add gradient definitions
-    parts.append("<defs>")
-    parts.append(f'<linearGradient id="barGradient" x1="0%" y1="0%" x2="100%" y2="0%">')
-    parts.append(f'  <stop offset="0%" style="stop-color:{bar};stop-opacity:1" />')
-    parts.append(f'  <stop offset="100%" style="stop-color:{bar_secondary};stop-opacity:1" />')
-    parts.append('</linearGradient>')
-    parts.append("</defs>")
-    
-    parts.append("<style>")
-    parts.append(
-        ".title{font:700 18px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
-        ".sub{font:500 12px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
-        ".label{font:600 12px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
-        ".count{font:700 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
-    )
-    parts.append("</style>")
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                entry = self.phases.setdefault(name, {"seconds": 0.0, "count": 0})
+                entry["seconds"] += elapsed
+                entry["count"] += 1
 
-    parts.append(f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{bg}"/>')
-    parts.append(f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{card}"/>')
+    def record_request(
+        self,
+        query: str,
+        seconds: float,
+        status: int | None,
+        bytes_sent: int,
+        bytes_received: int,
+        retry: bool,
+    ) -> None:
+        operation = GraphQLResponseCache.operation_name(query)
+        with self._lock:
+            self.requests += 1
+            self.retries += int(retry)
+            self.latencies.append(seconds)
+            self.by_operation[operation] = self.by_operation.get(operation, 0) + 1
+            key = str(status) if status is not None else "connection_error"
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self.bytes_sent += bytes_sent
+            self.bytes_received += bytes_received
 
-    title = f"Commits por repositório — {period_label}"
-    subtitle = f"@{username} • Top {len(rows)} (por commits)"
-    parts.append(f'<text x="{padding}" y="{padding + 18}" class="title" fill="{text}">{_escape_xml(title)}</text>')
-    parts.append(f'<text x="{padding}" y="{padding + 38}" class="sub" fill="{muted}">{_escape_xml(subtitle)}</text>')
+    def record_response(self, query: str, data: dict[str, Any], cached: bool) -> None:
+        rate_limit = data.get("rateLimit") if isinstance(data, dict) else None
+        with self._lock:
+            if cached:
+                self.cache_hits += 1
+                return
+            # Queries taking a cursor walk a connection, one page per response
+            if "$cursor" in query:
+                self.pages_fetched += 1
+            if rate_limit:
+                self.rate_limit_cost += int(rate_limit.get("cost") or 0)
+                self.rate_limit_last = dict(rate_limit)
+                remaining = rate_limit.get("remaining")
+                if remaining is not None and (
+                    self.rate_limit_min_remaining is None or remaining < self.rate_limit_min_remaining
+                ):
+                    self.rate_limit_min_remaining = int(remaining)
 
-    start_y = padding + title_h + 16
-    for i, r in enumerate(rows):
-        y = start_y + i * row_h
-        repo_label = r.name_with_owner
-        if len(repo_label) > 36:
-            repo_label = "…" + repo_label[-35:]
+    @staticmethod
+    def _percentile(ordered: list[float], q: float) -> float | None:
+        if not ordered:
+            return None
+        # Nearest-rank percentile
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
 
-        parts.append(f'<text x="{padding}" y="{y}" class="label" fill="{text}">{_escape_xml(repo_label)}</text>')
+    def to_dict(self) -> dict[str, Any]:
+        with self._lock:
+            ordered = sorted(self.latencies)
+            return {
+                "started_at": self.started_at.isoformat(),
+                "wall_seconds": round(time.perf_counter() - self._start, 6),
+                "phases": {k: {"seconds": round(v["seconds"], 6), "count": int(v["count"])} for k, v in self.phases.items()},
+                "graphql": {
+                    "requests": self.requests,
+                    "retries": self.retries,
+                    "cache_hits": self.cache_hits,
+                    "pages_fetched": self.pages_fetched,
+                    "bytes_sent": self.bytes_sent,
+                    "bytes_received": self.bytes_received,
+                    "by_operation": dict(self.by_operation),
+                    "statuses": dict(self.statuses),
+                    "latency_seconds": {
+                        f"p{q}": self._percentile(ordered, q) for q in (50, 90, 95, 99)
+                    }
+                    | {"max": ordered[-1] if ordered else None, "sum": round(sum(ordered), 6), "count": len(ordered)},
+                },
+                "rate_limit": {
+                    "total_cost": self.rate_limit_cost,
+                    "min_remaining": self.rate_limit_min_remaining,
+                    "last": self.rate_limit_last,
+                },
+            }
 
-        bar_x = padding + 320
-        bar_y = y - 10
-        parts.append(f'<rect x="{bar_x}" y="{bar_y}" width="420" height="{bar_h}" rx="5" fill="{bar_bg}"/>')
-        parts.append(f'<rect x="{bar_x}" y="{bar_y}" width="{scale(r.commit_contributions)}" height="{bar_h}" rx="5" fill="url(#barGradient)"/>')
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2) + "\n", encoding="utf-8")
+
+    def write_prometheus(self, path: Path, prefix: str = "profile_assets") -> None:
+        snapshot = self.to_dict()
+        gql = snapshot["graphql"]
+        lines: list[str] = []
 
-        parts.append(
-            f'<text x="{bar_x + 430}" y="{y}" class="count" fill="{muted}">{r.commit_contributions}</text>'
+        def metric(name: str, kind: str, help_text: str, samples: list[tuple[str, Any]]) -> None:
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                if value is not None:
+                    lines.append(f"{prefix}_{name}{labels} {value}")
+
+        metric("run_seconds", "gauge", "Wall time of the run.", [("", snapshot["wall_seconds"])])
+        metric(
+            "phase_seconds",
+            "gauge",
+            "Time spent per phase.",
+            [(f'{{phase="{k}"}}', v["seconds"]) for k, v in snapshot["phases"].items()],
+        )
+        metric(
+            "graphql_requests_total",
+            "counter",
+            "GraphQL HTTP requests by operation.",
+            [(f'{{operation="{k}"}}', v) for k, v in gql["by_operation"].items()],
+        )
+        metric("graphql_retries_total", "counter", "Retried GraphQL requests.", [("", gql["retries"])])
+        metric("graphql_cache_hits_total", "counter", "Responses served from the cache.", [("", gql["cache_hits"])])
+        metric("graphql_pages_total", "counter", "Connection pages fetched.", [("", gql["pages_fetched"])])
+        metric(
+            "graphql_bytes_total",
+            "counter",
+            "Bytes transferred.",
+            [('{direction="sent"}', gql["bytes_sent"]), ('{direction="received"}', gql["bytes_received"])],
+        )
+        metric(
+            "graphql_latency_seconds",
+            "summary",
+            "GraphQL request latency.",
+            [
+                (f'{{quantile="{int(k[1:]) / 100}"}}', v)
+                for k, v in gql["latency_seconds"].items()
+                if k.startswith("p")
+            ]
+            # The suffixes land right after the name: <name>_sum and <name>_count
+            + [("_sum", gql["latency_seconds"]["sum"]), ("_count", gql["latency_seconds"]["count"])],
         )
+        metric("rate_limit_cost_total", "counter", "GraphQL rate-limit points spent.", [("", snapshot["rate_limit"]["total_cost"])])
+        last = snapshot["rate_limit"]["last"] or {}
+        metric("rate_limit_remaining", "gauge", "Points left in the current window.", [("", last.get("remaining"))])
 
-    parts.append("</svg>")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text("\n".join(parts), encoding="utf-8")
-    print(f"  → Generated SVG with {len(rows)} repositories")
-    print(f"  → File size: {out_path.stat().st_size} bytes")
 
+class RateLimitBudget:
+    """Paces GraphQL traffic by the rateLimit block returned with each response.
 
-def render_repos_markdown(username: str, repos: list[RepoInfo], out_path: Path) -> None:
-    lines: list[str] = []
-    lines.append(f"# Repositórios ({username})")
-    lines.append("")
-    lines.append(f"Atualizado automaticamente por GitHub Actions em {dt.datetime.now(dt.timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}.\n")
-    lines.append("| Repositório | Linguagem | Stars | Último push |")
-    lines.append("|---|---:|---:|---:|")
+    `reserve` points of the hourly window are never touched (other jobs
+    share the token) and `window_budget`, when set, caps what this process
+    spends per window. Within those limits it sizes repository pages to the
+    points left, scales batch concurrency down as the window drains, and
+    when a request no longer fits, sleeps until resetAt instead of letting
+    the request fail.
+    """
 
-    def fmt_date(iso: str | None) -> str:
-        if not iso:
-            return "—"
-        try:
-            return dt.datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%Y-%m-%d")
-        except Exception:
-            return iso
+    def __init__(
+        self,
+        reserve: int = 100,
+        window_budget: int | None = None,
+        max_concurrency: int = 8,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.reserve = reserve
+        self.window_budget = window_budget
+        self.max_concurrency = max(1, max_concurrency)
+        self._sleep = sleep
+        self._cond = threading.Condition()
+        self.limit: int | None = None
+        self.remaining: int | None = None
+        self.reset_at: float | None = None
+        self.spent = 0
+        self.pauses = 0
+        self._cost_per_node: float | None = None
+        self._active = 0
 
-    for r in repos:
-        lang = r.primary_language or "—"
-        pushed = fmt_date(r.pushed_at)
-        lines.append(f"| [{r.name_with_owner}]({r.url}) | {lang} | {r.stars} | {pushed} |")
+    def observe(self, rate_limit: dict[str, Any] | None, nodes: int | None = None) -> None:
+        if not rate_limit:
+            return
+        with self._cond:
+            cost = int(rate_limit.get("cost") or 0)
+            self.spent += cost
+            if rate_limit.get("remaining") is not None:
+                self.remaining = int(rate_limit["remaining"])
+                self.limit = max(self.limit or 0, self.remaining + cost)
+            if rate_limit.get("limit") is not None:
+                self.limit = int(rate_limit["limit"])
+            reset = rate_limit.get("resetAt")
+            if reset:
+                self.reset_at = dt.datetime.fromisoformat(str(reset).replace("Z", "+00:00")).timestamp()
+            if nodes:
+                self._cost_per_node = cost / nodes
+            self._cond.notify_all()
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    def _roll_window(self) -> None:
+        if self.reset_at is not None and time.time() >= self.reset_at:
+            self.remaining = None
+            self.reset_at = None
+            self.spent = 0
 
+    def available(self) -> float:
+        """Points usable before the next reset (infinite until the first response)"""
+        with self._cond:
+            self._roll_window()
+            points = math.inf if self.remaining is None else self.remaining - self.reserve
+            if self.window_budget is not None:
+                points = min(points, self.window_budget - self.spent)
+            return points
 
-def update_readme_repo_section(username: str, repos: list[RepoInfo]) -> None:
-    readme_candidates = [ROOT / "README.md", ROOT / "Readme.md"]
-    readme_path = next((p for p in readme_candidates if p.exists()), None)
-    if not readme_path:
-        raise RuntimeError("README not found (expected README.md or Readme.md)")
+    def acquire(self, cost: float = 1) -> None:
+        """Block until `cost` points fit, sleeping past resetAt when the window is used up"""
+        while True:
+            if self.available() >= cost:
+                return
+            with self._cond:
+                reset_at = self.reset_at
+            wait = max(1.0, (reset_at or time.time()) - time.time() + 1)
+            self.pauses += 1
+            print(f"  ⏸ GraphQL budget used up, pausing {wait:.0f}s until the rate-limit window resets")
+            self._sleep(wait)
+            if reset_at is None:
+                # No resetAt seen yet; give up waiting on a window we know nothing about
+                return
 
-    start_marker = "<!-- REPOS-LIST:START -->"
-    end_marker = "<!-- REPOS-LIST:END -->"
-    content = readme_path.read_text(encoding="utf-8")
+    def page_size(self, default: int = 100, minimum: int = 10) -> int:
+        """Largest page (up to `default`) whose estimated cost fits in the points left"""
+        points = self.available()
+        if self._cost_per_node is None or points == math.inf:
+            return default
+        if self._cost_per_node <= 0:
+            return default
+        return max(minimum, min(default, int(points / self._cost_per_node)))
 
-    print(f"📖 Reading {readme_path.name}...")
-    print(f"   File size: {len(content)} chars")
-    print(f"   Looking for: {start_marker}")
-    print(f"   Found START at position: {content.find(start_marker)}")
-    print(f"   Found END at position: {content.find(end_marker)}")
-    
-    start_idx = content.find(start_marker)
-    end_idx = content.find(end_marker)
-    if start_idx == -1 or end_idx == -1 or end_idx <= start_idx:
-        print("\n❌ Markers not found or invalid!")
-        print(f"   START marker found: {start_idx != -1}")
-        print(f"   END marker found: {end_idx != -1}")
-        if start_idx != -1 and end_idx != -1:
-            print(f"   Distance between markers: {end_idx - start_idx} chars")
-        print("\nSearching for similar patterns...")
-        if "REPOS-LIST" in content:
-            print("   ✓ Found 'REPOS-LIST' in file")
-            # Show lines with REPOS-LIST
-            for i, line in enumerate(content.split('\n'), 1):
-                if "REPOS-LIST" in line:
-                    print(f"   Line {i}: {repr(line)}")
-        raise RuntimeError("Repo markers not found in README. Add REPOS-LIST markers first.")
+    def concurrency(self) -> int:
+        """Workers allowed now: all of them with half the window left, one near the reserve"""
+        points = self.available()
+        if points == math.inf or not self.limit:
+            return self.max_concurrency
+        share = points / max(1.0, (self.limit - self.reserve) / 2)
+        return max(1, min(self.max_concurrency, int(self.max_concurrency * share)))
 
-    def fmt_date(iso: str | None) -> str:
-        if not iso:
-            return "—"
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Hold one of the concurrency() slots for the duration of a job"""
+        with self._cond:
+            while self._active >= self.concurrency():
+                self._cond.wait(timeout=1.0)
+            self._active += 1
         try:
-            return dt.datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%Y-%m-%d")
-        except Exception:
-            return iso
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
 
+
+# Operations that go stale at a different pace than --cache-ttl's default:
+# an account's creation date never changes, while the contribution queries
+# end at today and pick up new commits throughout the day.
+CACHE_TTLS: dict[str, float] = {
+    "AccountCreated": 7 * 24 * 3600,
+    "ContributionCalendar": 15 * 60,
+    "CommitContributions": 15 * 60,
+    "ProfileBundle": 15 * 60,
+}
+
+
+class GraphQLResponseCache:
+    """Persistent cache of GraphQL responses, keyed by query text plus variables.
+
+    Each entry is one JSON file. Entries expire after the TTL configured for
+    their operation name (falling back to default_ttl), and the directory is
+    kept under max_bytes by evicting the least recently used files; a hit
+    touches the file's mtime, which is what the eviction order is based on.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        default_ttl: float = 3600,
+        ttls: dict[str, float] | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self.directory = directory
+        self.default_ttl = default_ttl
+        self.ttls = ttls or {}
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".json"))
+
+    @staticmethod
+    def operation_name(query: str) -> str:
+        match = re.search(r"\b(?:query|mutation)\s+(\w+)", query)
+        return match.group(1) if match else "anonymous"
+
+    @staticmethod
+    def key(query: str, variables: dict[str, Any] | None) -> str:
+        normalized = " ".join(query.split())
+        blob = json.dumps([normalized, variables or {}], sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, query: str, variables: dict[str, Any] | None) -> dict[str, Any] | None:
+        path = self._path(self.key(query, variables))
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        ttl = self.ttls.get(self.operation_name(query), self.default_ttl)
+        if time.time() - float(entry.get("stored_at", 0)) > ttl:
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("data")
+
+    def put(self, query: str, variables: dict[str, Any] | None, data: dict[str, Any]) -> None:
+        path = self._path(self.key(query, variables))
+        blob = json.dumps(
+            {"stored_at": time.time(), "operation": self.operation_name(query), "data": data},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(blob)
+
+        with self._lock:
+            try:
+                self._size -= path.stat().st_size
+            except OSError:
+                pass
+            os.replace(tmp, path)
+            self._size += len(blob)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(
+            (e for e in os.scandir(self.directory) if e.name.endswith(".json")),
+            key=lambda e: e.stat().st_mtime,
+        )
+        self._size = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._size -= size
+
+
+class GraphQLTransport:
+    """Pooled, retrying client for the GitHub GraphQL API.
+
+    One instance is shared by every fetch function (and every worker in batch
+    mode) so connections are kept alive instead of re-doing the TLS handshake
+    on each page. Transient failures, 5xx responses and secondary/abuse rate
+    limits are retried with jittered exponential backoff, honoring Retry-After.
+
+    With a cache, fresh responses are served from disk without touching the
+    network; refresh=True skips the lookup but still stores the new response.
+    """
+
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(
+        self,
+        token: str,
+        endpoint: str | None = None,
+        timeout: float = 30,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        pool_size: int = 16,
+        cache: GraphQLResponseCache | None = None,
+        refresh: bool = False,
+        metrics: RunMetrics | None = None,
+        budget: RateLimitBudget | None = None,
+    ) -> None:
+        self.cache = cache
+        self.metrics = metrics or RunMetrics()
+        self.budget = budget
+        self.refresh = refresh
+        self.endpoint = endpoint or os.getenv("GITHUB_GRAPHQL_URL") or GITHUB_GRAPHQL_URL
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        import requests.adapters
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+        )
+
+    def __enter__(self) -> GraphQLTransport:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.session.close()
+
+    def execute(self, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+        if self.cache is not None and not self.refresh:
+            cached = self.cache.get(query, variables)
+            if cached is not None:
+                self.metrics.record_response(query, cached, cached=True)
+                return cached
+
+        if self.budget is not None:
+            self.budget.acquire()
+        data = self._post(query, variables)
+        self.metrics.record_response(query, data, cached=False)
+        if self.budget is not None:
+            self.budget.observe(data.get("rateLimit"), (variables or {}).get("first"))
+        if self.cache is not None:
+            self.cache.put(query, variables, data)
+        return data
+
+    def _post(self, query: str, variables: dict[str, Any] | None) -> dict[str, Any]:
+        import requests
+
+        body = json.dumps({"query": query, "variables": variables or {}}).encode("utf-8")
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.post(self.endpoint, data=body, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as exc:
+                self.metrics.record_request(query, time.perf_counter() - start, None, len(body), 0, attempt > 0)
+                if attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                print(f"  ⚠ GraphQL request failed ({exc.__class__.__name__}), retrying in {delay:.1f}s")
+            else:
+                self.metrics.record_request(
+                    query,
+                    time.perf_counter() - start,
+                    response.status_code,
+                    len(body),
+                    len(response.content),
+                    attempt > 0,
+                )
+                delay = self._retry_delay(response, attempt)
+                if delay is None:
+                    response.raise_for_status()
+                    payload = response.json()
+                    if payload.get("errors"):
+                        raise RuntimeError(f"GraphQL errors: {payload['errors']}")
+                    return payload["data"]
+                print(f"  ⚠ GraphQL HTTP {response.status_code}, retrying in {delay:.1f}s")
+            attempt += 1
+            time.sleep(delay)
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: spreads retries from concurrent workers apart
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float | None:
+        """Seconds to wait before retrying response, or None when it must not be retried"""
+        if attempt >= self.max_retries:
+            return None
+
+        status = response.status_code
+        retry_after = response.headers.get("Retry-After")
+        if status in (403, 429):
+            if retry_after is None:
+                if response.headers.get("X-RateLimit-Remaining") == "0":
+                    reset = response.headers.get("X-RateLimit-Reset")
+                    if reset and reset.isdigit():
+                        return max(0.0, int(reset) - time.time()) + 1
+                text = response.text.lower()
+                if "secondary rate limit" not in text and "abuse" not in text:
+                    return None
+        elif status == 200:
+            # Rate limiting can also come back as a 200 with a RATE_LIMITED error
+            try:
+                errors = response.json().get("errors") or []
+            except ValueError:
+                return None
+            if not any(e.get("type") == "RATE_LIMITED" for e in errors if isinstance(e, dict)):
+                return None
+        elif status not in self.RETRY_STATUSES:
+            return None
+
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                import email.utils
+
+                try:
+                    when = email.utils.parsedate_to_datetime(retry_after)
+                    return max(0.0, (when - dt.datetime.now(dt.timezone.utc)).total_seconds())
+                except (TypeError, ValueError):
+                    pass
+        return self._backoff(attempt)
+
+
+_TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T[\d:.]+(Z|[+-]\d{2}:?\d{2})?$")
+
+
+class Cassette:
+    """Recorded GraphQL exchanges (query, variables, data), stored as JSON.
+
+    Lookups match on query text plus variables. Repeated identical requests
+    replay their responses in recorded order, and when no exact match exists
+    timestamp variables are ignored, so windows ending "now" still replay.
+    """
+
+    def __init__(self, interactions: list[dict[str, Any]] | None = None) -> None:
+        self.interactions: list[dict[str, Any]] = interactions or []
+        self._lock = threading.Lock()
+        self._index: dict[str, list[dict[str, Any]]] = {}
+        self._loose: dict[str, list[dict[str, Any]]] = {}
+        self._served: dict[str, int] = {}
+        for item in self.interactions:
+            self._add_to_index(item)
+
+    @classmethod
+    def load(cls, path: Path) -> Cassette:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        return cls(payload.get("interactions", []))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {"version": 1, "interactions": list(self.interactions)}
+        path.write_text(json.dumps(payload, ensure_ascii=False, indent=1) + "\n", encoding="utf-8")
+
+    @staticmethod
+    def _loose_key(query: str, variables: dict[str, Any] | None) -> str:
+        stable = {
+            k: v
+            for k, v in (variables or {}).items()
+            if not (isinstance(v, str) and _TIMESTAMP_RE.match(v))
+        }
+        return GraphQLResponseCache.key(query, stable)
+
+    def _add_to_index(self, item: dict[str, Any]) -> None:
+        self._index.setdefault(GraphQLResponseCache.key(item["query"], item.get("variables")), []).append(item)
+        self._loose.setdefault(self._loose_key(item["query"], item.get("variables")), []).append(item)
+
+    def add(self, query: str, variables: dict[str, Any] | None, data: dict[str, Any]) -> None:
+        item = {"query": query, "variables": variables or {}, "data": data}
+        with self._lock:
+            self.interactions.append(item)
+            self._add_to_index(item)
+
+    def lookup(self, query: str, variables: dict[str, Any] | None) -> dict[str, Any] | None:
+        exact = GraphQLResponseCache.key(query, variables)
+        loose = self._loose_key(query, variables)
+        for counter, matches in (("exact:" + exact, self._index.get(exact)), ("loose:" + loose, self._loose.get(loose))):
+            if not matches:
+                continue
+            with self._lock:
+                served = self._served.get(counter, 0)
+                self._served[counter] = served + 1
+            return matches[min(served, len(matches) - 1)]["data"]
+        return None
+
+
+class RecordingTransport(GraphQLTransport):
+    """GraphQLTransport that also appends every network exchange to a cassette
+
+    Cached responses are never read while recording (they are still
+    stored), so every exchange of the run reaches the network and the
+    cassette.
+    """
+
+    def __init__(self, token: str, cassette_path: Path, **kwargs: Any) -> None:
+        super().__init__(token, **{**kwargs, "refresh": True})
+        self.cassette_path = cassette_path
+        self.cassette = Cassette()
+
+    def _post(self, query: str, variables: dict[str, Any] | None) -> dict[str, Any]:
+        data = super()._post(query, variables)
+        self.cassette.add(query, variables, data)
+        return data
+
+    def close(self) -> None:
+        super().close()
+        self.cassette.save(self.cassette_path)
+        print(f"✓ Recorded {len(self.cassette.interactions)} GraphQL exchanges to {self.cassette_path}")
+
+
+class ReplayTransport(GraphQLTransport):
+    """GraphQLTransport answering from a cassette instead of the network"""
+
+    def __init__(self, cassette_path: Path, **kwargs: Any) -> None:
+        super().__init__("replay", **kwargs)
+        self.cassette = Cassette.load(cassette_path)
+
+    def _post(self, query: str, variables: dict[str, Any] | None) -> dict[str, Any]:
+        data = self.cassette.lookup(query, variables)
+        if data is None:
+            raise RuntimeError(
+                f"No recorded response for {GraphQLResponseCache.operation_name(query)} with variables {variables}"
+            )
+        return data
+
+
+def _graphql(transport: GraphQLTransport, query: str, variables: dict[str, Any] | None = None) -> dict[str, Any]:
+    return transport.execute(query, variables)
+
+
+def _page_size(transport: GraphQLTransport, default: int = 100) -> int:
+    if transport.budget is None:
+        return default
+    # Wait out an exhausted window first, so the page is sized for the new one
+    transport.budget.acquire()
+    return transport.budget.page_size(default)
+
+
+MAX_CONTRIBUTION_WINDOW_DAYS = 365
+
+_CONTRIBUTIONS_FIELDS = """
+          commitContributionsByRepository(maxRepositories: 100) {
+            repository { nameWithOwner url }
+            contributions { totalCount }
+          }
+"""
+
+_REPOSITORY_NODE_FIELDS = """
+            nameWithOwner
+            url
+            stargazerCount
+            pushedAt
+            primaryLanguage { name }
+            defaultBranchRef {
+              target {
+                ... on Commit {
+                  history(first: 0) {
+                    totalCount
+                  }
+                }
+              }
+            }
+"""
+
+
+def _contribution_windows(days: int) -> list[tuple[dt.datetime, dt.datetime]]:
+    """Split the last `days` days into contributionsCollection-sized (<= 1 year) windows"""
+    # Hour granularity keeps the variables (and so the cache key) stable between close runs
+    to_date = dt.datetime.now(dt.timezone.utc).replace(minute=0, second=0, microsecond=0)
+    start = to_date - dt.timedelta(days=days)
+
+    windows: list[tuple[dt.datetime, dt.datetime]] = []
+    end = to_date
+    while end > start:
+        begin = max(start, end - dt.timedelta(days=MAX_CONTRIBUTION_WINDOW_DAYS))
+        windows.append((begin, end))
+        end = begin
+    return windows
+
+
+def build_profile_query(window_count: int, include_repositories: bool = True) -> str:
+    """One query with an aliased contributionsCollection per window (w0, w1, ...)
+    and, optionally, the first page of repositories.
+
+    Both hang off repositoryOwner so organisation logins resolve too; the
+    windows sit in a User fragment and simply come back absent for an org.
+    Variables: $login, $from<i>/$to<i> per window and $cursor for the page.
+    """
+    params = ["$login: String!"]
+    params += [f"$from{i}: DateTime!, $to{i}: DateTime!" for i in range(window_count)]
+    windows = "".join(
+        f"          w{i}: contributionsCollection(from: $from{i}, to: $to{i}) {{{_CONTRIBUTIONS_FIELDS}          }}\n"
+        for i in range(window_count)
+    )
+    windows = f"        ... on User {{\n{windows}        }}\n"
+    repositories = ""
+    if include_repositories:
+        params.append("$cursor: String")
+        repositories = f"""        repositories(
+          first: 100,
+          after: $cursor,
+          ownerAffiliations: OWNER,
+          privacy: PUBLIC,
+          orderBy: {{field: PUSHED_AT, direction: DESC}}
+        ) {{
+          pageInfo {{ hasNextPage endCursor }}
+          nodes {{{_REPOSITORY_NODE_FIELDS}          }}
+        }}
+"""
+    name = "ProfileBundle" if include_repositories else "CommitContributions"
+    return (
+        f"query {name}({', '.join(params)}) {{\n"
+        "      rateLimit { cost remaining resetAt }\n"
+        "      repositoryOwner(login: $login) {\n"
+        f"{windows}{repositories}"
+        "      }\n"
+        "    }\n"
+    )
+
+
+def _window_variables(username: str, windows: list[tuple[dt.datetime, dt.datetime]]) -> dict[str, Any]:
+    variables: dict[str, Any] = {"login": username}
+    for i, (begin, end) in enumerate(windows):
+        variables[f"from{i}"] = begin.isoformat()
+        variables[f"to{i}"] = end.isoformat()
+    return variables
+
+
+def _merge_contribution_windows(owner: dict[str, Any], window_count: int) -> list[RepoCommitStat]:
+    totals: dict[str, RepoCommitStat] = {}
+    for i in range(window_count):
+        items = (owner.get(f"w{i}") or {}).get("commitContributionsByRepository", []) or []
+        for item in items:
+            repo = item.get("repository") or {}
+            contrib = item.get("contributions") or {}
+            total = int(contrib.get("totalCount") or 0)
+            if total <= 0:
+                continue
+            name = str(repo.get("nameWithOwner"))
+            previous = totals.get(name)
+            totals[name] = RepoCommitStat(
+                name_with_owner=name,
+                url=str(repo.get("url")),
+                commit_contributions=total + (previous.commit_contributions if previous else 0),
+            )
+
+    stats = list(totals.values())
+    stats.sort(key=lambda s: s.commit_contributions, reverse=True)
+    return stats
+
+
+def fetch_commit_contributions_by_repo(transport: GraphQLTransport, username: str, days: int = 365) -> list[RepoCommitStat]:
+    # contributionsCollection spans at most a year, so longer periods are
+    # requested as aliased yearly windows in a single round trip and summed
+    windows = _contribution_windows(days)
+    data = _graphql(
+        transport,
+        build_profile_query(len(windows), include_repositories=False),
+        _window_variables(username, windows),
+    )
+    return _merge_contribution_windows(data.get("repositoryOwner") or {}, len(windows))
+
+
+_CALENDAR_FIELDS = """
+          contributionCalendar {
+            weeks { contributionDays { date contributionCount } }
+          }
+"""
+
+ACCOUNT_CREATED_QUERY = """
+query AccountCreated($login: String!) {
+  rateLimit { cost remaining resetAt }
+  repositoryOwner(login: $login) { ... on User { createdAt } }
+}
+"""
+
+
+def build_calendar_query(window_count: int) -> str:
+    """One query with an aliased contributionCalendar per window (w0, w1, ...)
+
+    Like build_profile_query it goes through repositoryOwner, so an
+    organisation login yields an empty calendar instead of NOT_FOUND.
+    """
+    params = ["$login: String!"]
+    params += [f"$from{i}: DateTime!, $to{i}: DateTime!" for i in range(window_count)]
+    windows = "".join(
+        f"          w{i}: contributionsCollection(from: $from{i}, to: $to{i}) {{{_CALENDAR_FIELDS}          }}\n"
+        for i in range(window_count)
+    )
+    windows = f"        ... on User {{\n{windows}        }}\n"
+    return (
+        f"query ContributionCalendar({', '.join(params)}) {{\n"
+        "      rateLimit { cost remaining resetAt }\n"
+        "      repositoryOwner(login: $login) {\n"
+        f"{windows}"
+        "      }\n"
+        "    }\n"
+    )
+
+
+def _calendar_windows(start: dt.date, end: dt.date) -> list[tuple[dt.datetime, dt.datetime]]:
+    """Whole-day windows of at most a year covering start..end.
+
+    Windows never split a day, so every day comes back complete from
+    exactly one of them (today excepted, which is refetched next run).
+    """
+    windows: list[tuple[dt.datetime, dt.datetime]] = []
+    day = start
+    while day <= end:
+        last = min(end, day + dt.timedelta(days=MAX_CONTRIBUTION_WINDOW_DAYS - 1))
+        begin = dt.datetime.combine(day, dt.time.min, dt.timezone.utc)
+        finish = dt.datetime.combine(last, dt.time(23, 59, 59), dt.timezone.utc)
+        windows.append((begin, finish))
+        day = last + dt.timedelta(days=1)
+    return windows
+
+
+def fetch_contribution_days(
+    transport: GraphQLTransport,
+    username: str,
+    start: dt.date,
+    end: dt.date,
+) -> dict[dt.date, int]:
+    """Daily contribution counts for start..end, every yearly window in one round trip"""
+    windows = _calendar_windows(start, end)
+    data = _graphql(transport, build_calendar_query(len(windows)), _window_variables(username, windows))
+    owner = data.get("repositoryOwner") or {}
+
+    days: dict[dt.date, int] = {}
+    for i, (begin, finish) in enumerate(windows):
+        calendar = (owner.get(f"w{i}") or {}).get("contributionCalendar") or {}
+        for week in calendar.get("weeks", []) or []:
+            for entry in week.get("contributionDays", []) or []:
+                day = dt.date.fromisoformat(entry["date"])
+                # Padding days outside a window would overwrite its neighbour's
+                if begin.date() <= day <= finish.date():
+                    days[day] = int(entry.get("contributionCount") or 0)
+    return days
+
+
+def fetch_profile_bundle(
+    transport: GraphQLTransport,
+    username: str,
+    days: int = 365,
+) -> tuple[list[RepoCommitStat], list[RepoInfo]]:
+    """Commit contributions for `days` plus every repository, starting with one request.
+
+    The contribution windows and the first repository page share a round
+    trip; only accounts with more than 100 repositories need further pages.
+    """
+    windows = _contribution_windows(days)
+    variables = _window_variables(username, windows)
+    variables["cursor"] = None
+    data = _graphql(transport, build_profile_query(len(windows)), variables)
+
+    owner = data.get("repositoryOwner") or {}
+    # An organisation has no contribution windows and so no stats
+    stats = _merge_contribution_windows(owner, len(windows))
+
+    container = owner.get("repositories") or {}
+    repos = [_repo_from_node(node) for node in container.get("nodes", []) or []]
+    for repo in repos:
+        print(f"  → {repo.name_with_owner}: {repo.total_commits} commits")
+
+    page = container.get("pageInfo", {})
+    if page.get("hasNextPage"):
+        repos.extend(fetch_all_repositories(transport, username, cursor=page.get("endCursor")))
+    return stats, repos
+
+
+def _total_commits_from_node(node: dict[str, Any]) -> int:
+    # Get total commits from default branch
+    default_branch = node.get("defaultBranchRef")
+    if not default_branch:
+        return 0
+    target = default_branch.get("target") or {}
+    history = target.get("history") or {}
+    return int(history.get("totalCount") or 0)
+
+
+def _repo_from_node(node: dict[str, Any], total_commits: int | None = None) -> RepoInfo:
+    lang = (node.get("primaryLanguage") or {}).get("name")
+    pushed_at = node.get("pushedAt")
+    return RepoInfo(
+        name_with_owner=str(node.get("nameWithOwner")),
+        url=str(node.get("url")),
+        stars=int(node.get("stargazerCount") or 0),
+        primary_language=str(lang) if lang else None,
+        pushed_at=str(pushed_at) if pushed_at else None,
+        total_commits=_total_commits_from_node(node) if total_commits is None else total_commits,
+    )
+
+
+def fetch_all_repositories(
+    transport: GraphQLTransport,
+    username: str,
+    cursor: str | None = None,
+) -> list[RepoInfo]:
+    return [repo for page in iter_repository_pages(transport, username, cursor) for repo in page]
+
+
+def iter_repositories(transport: GraphQLTransport, username: str) -> Iterator[RepoInfo]:
+    """fetch_all_repositories as a generator; only the current page is held in memory"""
+    for page in iter_repository_pages(transport, username):
+        yield from page
+
+
+def iter_repository_pages(
+    transport: GraphQLTransport,
+    username: str,
+    cursor: str | None = None,
+) -> Iterator[list[RepoInfo]]:
+    """Yield the owner's public repositories one GraphQL page at a time, most recently pushed first"""
+    query = f"""
+    query RepositoryPage($login: String!, $cursor: String, $first: Int!) {{
+      rateLimit {{ cost remaining resetAt }}
+      repositoryOwner(login: $login) {{
+        repositories(
+          first: $first,
+          after: $cursor,
+          ownerAffiliations: OWNER,
+          privacy: PUBLIC,
+          orderBy: {{field: PUSHED_AT, direction: DESC}}
+        ) {{
+          pageInfo {{ hasNextPage endCursor }}
+          nodes {{{_REPOSITORY_NODE_FIELDS}          }}
+        }}
+      }}
+    }}
+    """
+
+    while True:
+        variables = {"login": username, "cursor": cursor, "first": _page_size(transport)}
+        data = _graphql(transport, query, variables)
+        container = (data.get("repositoryOwner") or {}).get("repositories", {})
+        nodes = container.get("nodes", []) or []
+
+        repos: list[RepoInfo] = []
+        for node in nodes:
+            repo = _repo_from_node(node)
+            print(f"  → {repo.name_with_owner}: {repo.total_commits} commits")
+            repos.append(repo)
+        yield repos
+
+        page = container.get("pageInfo", {})
+        if not page.get("hasNextPage"):
+            break
+        cursor = page.get("endCursor")
+
+
+# The search API returns at most this many results per query, however many pages are walked
+SEARCH_RESULT_LIMIT = 1000
+# Nothing on GitHub was created before this
+_SEARCH_EPOCH = dt.datetime(2007, 10, 1, tzinfo=dt.timezone.utc)
+
+
+def _search_qualifier(login: str, start: dt.datetime, end: dt.datetime) -> str:
+    # Both ends of a created: range are inclusive, slices end one second before the next starts
+    fmt = "%Y-%m-%dT%H:%M:%S+00:00"
+    last = end - dt.timedelta(seconds=1)
+    return f"user:{login} is:public fork:true created:{start.strftime(fmt)}..{last.strftime(fmt)}"
+
+
+def _count_search_slices(
+    transport: GraphQLTransport,
+    login: str,
+    slices: list[tuple[dt.datetime, dt.datetime]],
+) -> list[int]:
+    """repositoryCount of every slice, 50 aliased searches per request"""
+    counts: list[int] = []
+    for offset in range(0, len(slices), 50):
+        batch = slices[offset : offset + 50]
+        params = ", ".join(f"$q{i}: String!" for i in range(len(batch)))
+        fields = "\n".join(f"      s{i}: search(type: REPOSITORY, query: $q{i}, first: 1) {{ repositoryCount }}" for i in range(len(batch)))
+        query = f"query RepositorySearchCounts({params}) {{\n      rateLimit {{ cost remaining resetAt }}\n{fields}\n    }}"
+        data = _graphql(transport, query, {f"q{i}": _search_qualifier(login, *span) for i, span in enumerate(batch)})
+        counts.extend(int((data.get(f"s{i}") or {}).get("repositoryCount") or 0) for i in range(len(batch)))
+    return counts
+
+
+def plan_repository_slices(
+    transport: GraphQLTransport,
+    username: str,
+    partitions: int = 8,
+    now: dt.datetime | None = None,
+) -> list[tuple[dt.datetime, dt.datetime, int]]:
+    """Split the owner's repositories into created: ranges the search API can list completely.
+
+    Starts from `partitions` equal ranges and halves every range holding
+    more than SEARCH_RESULT_LIMIT repositories until none does; empty
+    ranges are dropped. Returns (start, end, count) with `end` exclusive.
+    """
+    end = (now or dt.datetime.now(dt.timezone.utc)).replace(microsecond=0) + dt.timedelta(seconds=1)
+    step = (end - _SEARCH_EPOCH) / max(1, partitions)
+    pending = [(_SEARCH_EPOCH + step * i, _SEARCH_EPOCH + step * (i + 1)) for i in range(max(1, partitions))]
+    pending[-1] = (pending[-1][0], end)
+    pending = [(a.replace(microsecond=0), b.replace(microsecond=0)) for a, b in pending]
+
+    planned: list[tuple[dt.datetime, dt.datetime, int]] = []
+    while pending:
+        counts = _count_search_slices(transport, username, pending)
+        split: list[tuple[dt.datetime, dt.datetime]] = []
+        for (start, stop), count in zip(pending, counts):
+            if count == 0:
+                continue
+            if count <= SEARCH_RESULT_LIMIT or stop - start <= dt.timedelta(seconds=1):
+                if count > SEARCH_RESULT_LIMIT:
+                    print(f"  ⚠ {count} repositories created at {start.isoformat()}; only {SEARCH_RESULT_LIMIT} can be listed")
+                planned.append((start, stop, count))
+                continue
+            middle = (start + (stop - start) / 2).replace(microsecond=0)
+            split.extend([(start, middle), (middle, stop)])
+        pending = split
+    planned.sort()
+    return planned
+
+
+def _fetch_search_slice(transport: GraphQLTransport, username: str, start: dt.datetime, end: dt.datetime) -> list[RepoInfo]:
+    query = f"""
+    query RepositorySearch($q: String!, $cursor: String) {{
+      rateLimit {{ cost remaining resetAt }}
+      search(type: REPOSITORY, query: $q, first: 100, after: $cursor) {{
+        pageInfo {{ hasNextPage endCursor }}
+        nodes {{
+          ... on Repository {{{_REPOSITORY_NODE_FIELDS}          }}
+        }}
+      }}
+    }}
+    """
+    qualifier = _search_qualifier(username, start, end)
+    repos: list[RepoInfo] = []
+    cursor: str | None = None
+    while True:
+        container = _graphql(transport, query, {"q": qualifier, "cursor": cursor}).get("search") or {}
+        repos.extend(_repo_from_node(node) for node in container.get("nodes") or [] if node)
+        page = container.get("pageInfo") or {}
+        if not page.get("hasNextPage"):
+            return repos
+        cursor = page.get("endCursor")
+
+
+def fetch_repositories_partitioned(
+    transport: GraphQLTransport,
+    username: str,
+    partitions: int = 8,
+    concurrency: int = 8,
+) -> list[RepoInfo]:
+    """fetch_all_repositories through the search API, walking independent slices concurrently.
+
+    The owner's repositories are split into created: date ranges (see
+    plan_repository_slices) whose cursor chains are followed in parallel,
+    so a 10k-repository organization costs ~100 pages spread over
+    `concurrency` connections instead of 100 serial round trips. Results
+    are de-duplicated by nameWithOwner and returned most recently pushed
+    first, like fetch_all_repositories.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    slices = plan_repository_slices(transport, username, partitions)
+    expected = sum(count for _, _, count in slices)
+    print(f"  → {expected} repositories in {len(slices)} slices")
+
+    owner = username.lower()
+    by_name: dict[str, RepoInfo] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(slices))), thread_name_prefix="slice") as pool:
+        for repos in pool.map(lambda span: _fetch_search_slice(transport, username, span[0], span[1]), slices):
+            for repo in repos:
+                # The search index can still list repositories transferred to another owner
+                if repo.name_with_owner.split("/")[0].lower() == owner:
+                    by_name[repo.name_with_owner] = repo
+
+    if len(by_name) != expected:
+        print(f"  ⚠ Search listed {len(by_name)} of {expected} repositories (index lag?)")
+    repos = sorted(by_name.values(), key=lambda r: r.pushed_at or "", reverse=True)
+    for repo in repos:
+        print(f"  → {repo.name_with_owner}: {repo.total_commits} commits")
+    return repos
+
+
+def load_snapshot(path: Path) -> dict[str, RepoInfo]:
+    """Read the RepoInfo list saved by the previous run, keyed by nameWithOwner"""
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    repos = (RepoInfo(**item) for item in payload.get("repos", []))
+    return {r.name_with_owner: r for r in repos}
+
+
+def save_snapshot(path: Path, repos: list[RepoInfo]) -> None:
+    payload = {
+        "saved_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "repos": [dataclasses.asdict(r) for r in repos],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def list_repositories(transport: GraphQLTransport, username: str) -> list[RepoInfo]:
+    """Cheap listing without the commit history subfield; total_commits is left at 0"""
+    query = """
+    query RepositoryListing($login: String!, $cursor: String, $first: Int!) {
+      rateLimit { cost remaining resetAt }
+      repositoryOwner(login: $login) {
+        repositories(
+          first: $first,
+          after: $cursor,
+          ownerAffiliations: OWNER,
+          privacy: PUBLIC,
+          orderBy: {field: PUSHED_AT, direction: DESC}
+        ) {
+          pageInfo { hasNextPage endCursor }
+          nodes {
+            nameWithOwner
+            url
+            stargazerCount
+            pushedAt
+            primaryLanguage { name }
+          }
+        }
+      }
+    }
+    """
+
+    repos: list[RepoInfo] = []
+    cursor: str | None = None
+    while True:
+        data = _graphql(transport, query, {"login": username, "cursor": cursor, "first": _page_size(transport)})
+        container = (data.get("repositoryOwner") or {}).get("repositories", {})
+        repos.extend(_repo_from_node(node, total_commits=0) for node in container.get("nodes", []) or [])
+
+        page = container.get("pageInfo", {})
+        if not page.get("hasNextPage"):
+            break
+        cursor = page.get("endCursor")
+    return repos
+
+
+def fetch_commit_totals(
+    transport: GraphQLTransport,
+    names_with_owner: list[str],
+    batch_size: int = 50,
+) -> dict[str, int]:
+    """Default-branch commit counts for specific repositories, batched with aliases"""
+    totals: dict[str, int] = {}
+    for start in range(0, len(names_with_owner), batch_size):
+        batch = names_with_owner[start : start + batch_size]
+        params = ", ".join(f"$o{i}: String!, $n{i}: String!" for i in range(len(batch)))
+        fields = "\n".join(
+            f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ nameWithOwner "
+            "defaultBranchRef { target { ... on Commit { history(first: 0) { totalCount } } } } }"
+            for i in range(len(batch))
+        )
+        query = f"query CommitTotals({params}) {{\nrateLimit {{ cost remaining resetAt }}\n{fields}\n}}"
+
+        variables: dict[str, Any] = {}
+        for i, name in enumerate(batch):
+            owner, _, repo_name = name.partition("/")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = repo_name
+
+        data = _graphql(transport, query, variables)
+        for i, name in enumerate(batch):
+            totals[name] = _total_commits_from_node(data.get(f"r{i}") or {})
+    return totals
+
+
+def fetch_repositories_incremental(
+    transport: GraphQLTransport,
+    username: str,
+    snapshot_path: Path,
+) -> list[RepoInfo]:
+    """Like fetch_all_repositories, but only asks for commit history of repos pushed since the snapshot"""
+    previous = load_snapshot(snapshot_path)
+    listing = list_repositories(transport, username)
+
+    stale = [
+        r.name_with_owner
+        for r in listing
+        if r.name_with_owner not in previous or previous[r.name_with_owner].pushed_at != r.pushed_at
+    ]
+    totals = fetch_commit_totals(transport, stale) if stale else {}
+    print(f"  → {len(listing) - len(stale)} repos unchanged since snapshot, {len(stale)} refreshed")
+
+    repos = [
+        dataclasses.replace(
+            r,
+            total_commits=totals[r.name_with_owner]
+            if r.name_with_owner in totals
+            else previous[r.name_with_owner].total_commits,
+        )
+        for r in listing
+    ]
+    save_snapshot(snapshot_path, repos)
+    return repos
+
+
+class GitMirrorCounter:
+    """Counts commits in local bare mirrors instead of asking GraphQL for history.totalCount.
+
+    Each repository is mirrored once under `directory` (treeless, since
+    rev-list only walks commits) and afterwards only fetched incrementally,
+    and only when its pushedAt moved since the last sync. Clones, fetches
+    and counts run in a thread pool; the work happens in git subprocesses,
+    so the threads do not contend for the GIL. `remote` maps a repository
+    to its clone URL, which lets tests point at local repositories.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        workers: int = 8,
+        remote: Callable[[RepoInfo], str] | None = None,
+        git: str = "git",
+    ) -> None:
+        self.directory = directory
+        self.workers = workers
+        self.remote = remote or (lambda repo: repo.url + ".git")
+        self.git = git
+        self.state_path = directory / "state.json"
+
+    def mirror_path(self, name_with_owner: str) -> Path:
+        owner, _, name = name_with_owner.partition("/")
+        return self.directory / owner.lower() / f"{name.lower()}.git"
+
+    def _run(self, *args: str, cwd: Path | None = None) -> str:
+        import subprocess
+
+        result = subprocess.run(
+            [self.git, *args],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+        return result.stdout
+
+    def sync(self, repo: RepoInfo) -> Path:
+        """Clone the mirror on first use, fetch new commits afterwards"""
+        path = self.mirror_path(repo.name_with_owner)
+        if (path / "HEAD").exists():
+            self._run("fetch", "--quiet", "--prune", "--no-tags", "origin", cwd=path)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._run("clone", "--quiet", "--mirror", "--filter=tree:0", self.remote(repo), str(path))
+        return path
+
+    def rev_count(self, path: Path, since: dt.datetime | None = None, author: str | None = None) -> int:
+        args = ["rev-list", "--count"]
+        if since is not None:
+            args.append(f"--since={since.isoformat()}")
+        if author:
+            args.append(f"--author={author}")
+        if not self._run("for-each-ref", "--count=1", "--format=%(refname)", "refs/heads", cwd=path).strip():
+            # Empty repositories have no branch (and so no HEAD commit) to count
+            return 0
+        # Any other failure propagates, so the repository is reported as
+        # failed and never remembered with a count of 0
+        return int(self._run(*args, "HEAD", cwd=path).strip() or 0)
+
+    def count(
+        self,
+        repos: list[RepoInfo],
+        since: dt.datetime | None = None,
+        author: str | None = None,
+    ) -> dict[str, int]:
+        """Commits on each repository's default branch, optionally since a date and/or by an author.
+
+        Only the plain totals (no `since`/`author`) are remembered between
+        runs; repositories whose pushedAt did not change reuse them without
+        running git at all. A repository git fails to sync keeps its last
+        remembered total, and is retried next run; one that was never
+        counted is left out of the result.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        plain = since is None and not author
+        try:
+            state: dict[str, Any] = json.loads(self.state_path.read_text(encoding="utf-8")) if plain else {}
+        except (OSError, ValueError):
+            state = {}
+
+        counts: dict[str, int] = {}
+        stale: list[RepoInfo] = []
+        for repo in repos:
+            known = state.get(repo.name_with_owner)
+            if known and known.get("pushed_at") == repo.pushed_at and self.mirror_path(repo.name_with_owner).exists():
+                counts[repo.name_with_owner] = int(known["commits"])
+            else:
+                stale.append(repo)
+
+        def work(repo: RepoInfo) -> tuple[str, int | None]:
+            try:
+                return repo.name_with_owner, self.rev_count(self.sync(repo), since, author)
+            except RuntimeError as exc:
+                print(f"  ⚠ {repo.name_with_owner}: {exc}")
+                return repo.name_with_owner, None
+
+        failed = 0
+        # Remembered entries of failed repositories, kept with their old pushedAt
+        retry: dict[str, Any] = {}
+        if stale:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(stale))), thread_name_prefix="git") as pool:
+                for name, total in pool.map(work, stale):
+                    if total is None:
+                        failed += 1
+                        if name in state:
+                            retry[name] = state[name]
+                            counts[name] = int(state[name]["commits"])
+                        continue
+                    counts[name] = total
+        print(f"  → git: {len(repos) - len(stale)} mirrors unchanged, {len(stale) - failed} synced, {failed} failed")
+
+        if plain:
+            pushed = {r.name_with_owner: r.pushed_at for r in repos}
+            state = {name: {"pushed_at": pushed[name], "commits": total} for name, total in counts.items()}
+            state.update(retry)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+            tmp.write_text(json.dumps(state, sort_keys=True), encoding="utf-8")
+            os.replace(tmp, self.state_path)
+        return counts
+
+
+def fetch_repositories_with_git(
+    transport: GraphQLTransport,
+    username: str,
+    counter: GitMirrorCounter,
+) -> list[RepoInfo]:
+    """fetch_all_repositories with total_commits counted from local mirrors.
+
+    The GraphQL side is the cheap RepositoryListing query. Repositories git
+    could not sync keep their last count; those it never counted fall back
+    to GraphQL history.totalCount.
+    """
+    listing = list_repositories(transport, username)
+    counts = counter.count(listing)
+    missing = [r.name_with_owner for r in listing if r.name_with_owner not in counts]
+    if missing:
+        counts.update(fetch_commit_totals(transport, missing))
+    return [dataclasses.replace(r, total_commits=counts.get(r.name_with_owner, 0)) for r in listing]
+
+
+@dataclass(frozen=True)
+class Theme:
+    """Colors of every chart; `dark` is the original palette"""
+
+    name: str
+    bg: str
+    card: str
+    text: str
+    muted: str
+    bar: str
+    bar_secondary: str
+    bar_bg: str
+    # Placeholder drawn when the commits chart has no data
+    empty_bg: str
+    empty_card: str
+    empty_text: str
+    empty_muted: str
+    # Repository cards
+    card_gradient: tuple[str, str]
+    card_inner: str
+    # Contribution heatmap, from no contributions to the busiest days
+    heat: tuple[str, str, str, str, str]
+
+
+@dataclass(frozen=True)
+class Locale:
+    """User-facing strings and date formats; `pt` is the original wording"""
+
+    code: str
+    overview_title: str
+    overview_subtitle: str  # {username} {repos} {commits}
+    page_label: str  # {page} {pages}
+    commits_unit: str
+    no_repos: str
+    commits_title: str  # {period}
+    commits_subtitle: str  # {username} {rows}
+    no_commits: str
+    no_commits_hint: str
+    period_year: str
+    period_days: str  # {days}
+    heatmap_title: str
+    heatmap_subtitle: str  # {username} {total} {since}
+    heatmap_year: str  # {year} {total}
+    all_time: str
+    short_date: str
+    long_date: str
+
+    def period(self, days: int) -> str:
+        return self.period_year if days == 365 else self.period_days.format(days=days)
+
+
+THEMES = {
+    "dark": Theme(
+        name="dark",
+        bg="#0d1117",
+        card="#161b22",
+        text="#c9d1d9",
+        muted="#8b949e",
+        bar="#8A2BE2",
+        bar_secondary="#a855f7",
+        bar_bg="#21262d",
+        empty_bg="#0b1020",
+        empty_card="#111827",
+        empty_text="#e5e7eb",
+        empty_muted="#9ca3af",
+        card_gradient=("#667eea", "#764ba2"),
+        card_inner="#1a1b27",
+        heat=("#21262d", "#3b2160", "#5b2a99", "#8A2BE2", "#c084fc"),
+    ),
+    "light": Theme(
+        name="light",
+        bg="#ffffff",
+        card="#f6f8fa",
+        text="#24292f",
+        muted="#57606a",
+        bar="#8250df",
+        bar_secondary="#a475f9",
+        bar_bg="#d0d7de",
+        empty_bg="#ffffff",
+        empty_card="#f6f8fa",
+        empty_text="#24292f",
+        empty_muted="#57606a",
+        card_gradient=("#8c9eff", "#b39ddb"),
+        card_inner="#ffffff",
+        heat=("#ebedf0", "#e0d4fb", "#c2a5f5", "#8250df", "#5a32a3"),
+    ),
+}
+
+LOCALES = {
+    "pt": Locale(
+        code="pt",
+        overview_title="Repositórios — Atividade e Stats",
+        overview_subtitle="@{username} • {repos} repos com total de {commits} commits",
+        page_label="página {page}/{pages}",
+        commits_unit="commits",
+        no_repos="Nenhum repositório encontrado",
+        commits_title="Commits por repositório — {period}",
+        commits_subtitle="@{username} • Top {rows} (por commits)",
+        no_commits="Nenhum commit encontrado no período selecionado.",
+        no_commits_hint="Isso pode acontecer se este for seu primeiro run ou se não houver atividade recente.",
+        period_year="últimos 12 meses",
+        period_days="últimos {days} dias",
+        heatmap_title="Contribuições por dia",
+        heatmap_subtitle="@{username} • {total} contribuições desde {since}",
+        heatmap_year="{year} • {total}",
+        all_time="todo o histórico",
+        short_date="%d/%m/%y",
+        long_date="%d/%m/%Y",
+    ),
+    "en": Locale(
+        code="en",
+        overview_title="Repositories — Activity and Stats",
+        overview_subtitle="@{username} • {repos} repos with {commits} commits in total",
+        page_label="page {page}/{pages}",
+        commits_unit="commits",
+        no_repos="No repositories found",
+        commits_title="Commits per repository — {period}",
+        commits_subtitle="@{username} • Top {rows} (by commits)",
+        no_commits="No commits found in the selected period.",
+        no_commits_hint="This can happen on a first run or when there has been no recent activity.",
+        period_year="last 12 months",
+        period_days="last {days} days",
+        heatmap_title="Contributions per day",
+        heatmap_subtitle="@{username} • {total} contributions since {since}",
+        heatmap_year="{year} • {total}",
+        all_time="all time",
+        short_date="%m/%d/%y",
+        long_date="%Y-%m-%d",
+    ),
+}
+
+DEFAULT_THEME = THEMES["dark"]
+DEFAULT_LOCALE = LOCALES["pt"]
+
+
+@dataclass(frozen=True)
+class Variant:
+    """One theme × locale combination, written next to the default file as <stem>-<theme>-<locale>.svg"""
+
+    theme: Theme
+    locale: Locale
+
+    @property
+    def suffix(self) -> str:
+        return f"-{self.theme.name}-{self.locale.code}"
+
+    @classmethod
+    def parse(cls, spec: str) -> Variant:
+        """`light-en` -> Variant(THEMES["light"], LOCALES["en"])"""
+        theme, _, locale = spec.partition("-")
+        if theme not in THEMES or locale not in LOCALES:
+            raise ValueError(
+                f"Unknown variant {spec!r}; expected <theme>-<locale> with theme in "
+                f"{', '.join(THEMES)} and locale in {', '.join(LOCALES)}"
+            )
+        return cls(THEMES[theme], LOCALES[locale])
+
+
+def _variant_path(path: Path, variant: Variant | None) -> Path:
+    return path if variant is None else path.with_name(f"{path.stem}{variant.suffix}{path.suffix}")
+
+
+def _variant_paths(path: Path, variants: Sequence[Variant], optimize: bool = False) -> list[Path]:
+    """Every file a render of `path` writes: the default, each variant and, optimized, their .svgz"""
+    paths = [_variant_path(path, v) for v in (None, *variants)]
+    if optimize:
+        paths += [p.with_suffix(".svgz") for p in paths]
+    return paths
+
+
+def _page_paths(
+    out_dir: Path, stem: str, page_count: int, variants: Sequence[Variant], optimize: bool = False
+) -> list[Path]:
+    """Every page render_paged_repos_svg writes: <stem>[-<theme>-<locale>]-<n>.svg and, optimized, their .svgz"""
+    paths = [
+        out_dir / f"{stem}{'' if v is None else v.suffix}-{page}.svg"
+        for v in (None, *variants)
+        for page in range(1, page_count + 1)
+    ]
+    if optimize:
+        paths += [p.with_suffix(".svgz") for p in paths]
+    return paths
+
+
+def _unwanted_variants(variants: Sequence[Variant]) -> Iterator[Variant]:
+    for theme in THEMES.values():
+        for locale in LOCALES.values():
+            variant = Variant(theme, locale)
+            if variant not in variants:
+                yield variant
+
+
+def _remove_stale_variants(path: Path, variants: Sequence[Variant]) -> None:
+    """Delete the variants of `path` (and their .svgz) an earlier run wrote but this one no longer does"""
+    for variant in _unwanted_variants(variants):
+        stale = _variant_path(path, variant)
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".svgz").unlink(missing_ok=True)
+
+
+def render_repo_card_svg(
+    repo: RepoInfo,
+    out_path: Path,
+    index: int,
+    optimize: bool = False,
+    theme: Theme = DEFAULT_THEME,
+    locale: Locale = DEFAULT_LOCALE,
+) -> None:
+    """Generate a beautiful SVG card for a single repository
+
+    With `optimize`, the compact markup is written and a .svgz sits next to it.
+    """
+    width = 440
+    height = 140
+    
+    repo_name = repo.name_with_owner.split('/')[-1]
+    lang = repo.primary_language or "Other"
+    
+    # Language colors
+    lang_colors = {
+        "Python": "#3776AB", "JavaScript": "#F7DF1E", "TypeScript": "#3178C6",
+        "Java": "#007396", "C#": "#239120", "C++": "#00599C", "Go": "#00ADD8",
+        "Rust": "#000000", "Ruby": "#CC342D", "PHP": "#777BB4", "Swift": "#FA7343",
+        "Kotlin": "#7F52FF", "Dart": "#0175C2", "HTML": "#E34F26", "CSS": "#1572B6"
+    }
+    color = lang_colors.get(lang, theme.bar)
+    grad_start, grad_end = theme.card_gradient
+    
+    # Format date
+    try:
+        pushed = dt.datetime.fromisoformat(repo.pushed_at.replace("Z", "+00:00")).strftime(locale.long_date) if repo.pushed_at else "—"
+    except:
+        pushed = "—"
+    
+    svg = f'''<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">
+  <defs>
+    <linearGradient id="grad{index}" x1="0%" y1="0%" x2="100%" y2="100%">
+      <stop offset="0%" style="stop-color:{grad_start};stop-opacity:1" />
+      <stop offset="100%" style="stop-color:{grad_end};stop-opacity:1" />
+    </linearGradient>
+  </defs>
+  
+  <rect width="{width}" height="{height}" rx="10" fill="url(#grad{index})"/>
+  <rect x="8" y="8" width="{width-16}" height="{height-16}" rx="8" fill="{theme.card_inner}" opacity="0.95"/>
+  
+  <g transform="translate(20, 25)">
+    <text x="0" y="0" fill="{theme.text}" font-family="ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial" font-size="18" font-weight="700">
+      📦 {_escape_xml(repo_name)}
+    </text>
+    
+    <g transform="translate(0, 30)">
+      <rect x="0" y="0" width="100" height="24" rx="12" fill="{color}" opacity="0.2"/>
+      <circle cx="12" cy="12" r="5" fill="{color}"/>
+      <text x="22" y="16" fill="{color}" font-family="ui-sans-serif,system-ui" font-size="13" font-weight="600">{_escape_xml(lang)}</text>
+    </g>
+    
+    <g transform="translate(0, 65)">
+      <text x="0" y="0" fill="{theme.muted}" font-family="ui-sans-serif,system-ui" font-size="13">
+        ⭐ <tspan fill="{theme.text}" font-weight="600">{repo.stars}</tspan>
+        <tspan dx="20">📅 {_escape_xml(pushed)}</tspan>
+      </text>
+    </g>
+  </g>
+</svg>'''
+    
+    if optimize:
+        svg = (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}">'
+            f'<defs><linearGradient id="g" x2="1" y2="1"><stop offset="0" stop-color="{grad_start}"/><stop offset="1" stop-color="{grad_end}"/></linearGradient></defs>'
+            f"<style>text{{font-family:{SVG_FONT_STACK}}}.t{{font-size:18px;font-weight:700;fill:{theme.text}}}"
+            f".l{{font-size:13px;font-weight:600;fill:{color}}}.m{{font-size:13px;fill:{theme.muted}}}</style>"
+            f'<rect width="{width}" height="{height}" rx="10" fill="url(#g)"/>'
+            f'<rect x="8" y="8" width="{width-16}" height="{height-16}" rx="8" fill="{theme.card_inner}" opacity=".95"/>'
+            f'<text x="20" y="25" class="t">📦 {_escape_xml(repo_name)}</text>'
+            f'<rect x="20" y="55" width="100" height="24" rx="12" fill="{color}" opacity=".2"/>'
+            f'<circle cx="32" cy="67" r="5" fill="{color}"/>'
+            f'<text x="42" y="71" class="l">{_escape_xml(lang)}</text>'
+            f'<text x="20" y="90" class="m">⭐ <tspan fill="{theme.text}" font-weight="600">{repo.stars}</tspan>'
+            f'<tspan dx="20">📅 {_escape_xml(pushed)}</tspan></text>'
+            "</svg>"
+        )
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(svg, encoding="utf-8")
+    if optimize:
+        _write_svgz(out_path)
+
+
+# (repo, out_path, optimize, theme name, locale code); names keep jobs cheap to pickle
+_CardJob = tuple[RepoInfo, str, bool, str, str]
+
+
+def _render_card_job(job: _CardJob) -> None:
+    repo, out_path, optimize, theme, locale = job
+    # Each card is a standalone file, so the gradient id never collides
+    render_repo_card_svg(repo, Path(out_path), 0, optimize, THEMES[theme], LOCALES[locale])
+
+
+def _render_card_batch(jobs: list[_CardJob]) -> None:
+    for job in jobs:
+        _render_card_job(job)
+
+
+def _card_pool(workers: int) -> Any:
+    """A process pool for card rendering that never forks this process.
+
+    Cards are rendered while fetch threads sit in network I/O; forking a
+    threaded parent can hand a child a lock some other thread held, so the
+    workers come from a forkserver (or are spawned where there is none).
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+
+
+def _card_jobs(
+    repos: Iterable[RepoInfo],
+    out_dir: Path,
+    manifest: OutputManifest,
+    optimize: bool,
+    wanted: set[str],
+    variants: Sequence[Variant] = (),
+) -> list[_CardJob]:
+    """Jobs for the cards whose repository changed since the last run; adds every card name to `wanted`
+
+    Each variant adds a <repo>-<theme>-<locale>.svg card next to the default one.
+    """
+    jobs: list[_CardJob] = []
+    for repo in repos:
+        base = out_dir / f"{repo.name_with_owner.split('/')[-1]}.svg"
+        for variant in (None, *variants):
+            path = _variant_path(base, variant)
+            wanted.add(path.name)
+            key = f"{out_dir.name}/{path.name}"
+            theme, locale = (DEFAULT_THEME, DEFAULT_LOCALE) if variant is None else (variant.theme, variant.locale)
+            digest = _input_digest(repo, optimize, theme, locale)
+            if manifest.is_current(key, digest, path):
+                continue
+            jobs.append((repo, str(path), optimize, theme.name, locale.code))
+            manifest.record(key, digest)
+    return jobs
+
+
+def _remove_stale_cards(out_dir: Path, wanted: set[str], manifest: OutputManifest) -> None:
+    for entry in os.scandir(out_dir):
+        if entry.name.endswith(".svgz") and entry.name[:-1] not in wanted:
+            os.remove(entry.path)
+        elif entry.name.endswith(".svg") and entry.name not in wanted:
+            os.remove(entry.path)
+            manifest.forget(f"{out_dir.name}/{entry.name}")
+
+
+def render_repo_cards(
+    repos: Iterable[RepoInfo],
+    out_dir: Path,
+    manifest: OutputManifest,
+    workers: int | None = None,
+    optimize: bool = False,
+    variants: Sequence[Variant] = (),
+    pool: Any = None,
+) -> int:
+    """Render one card per repository (and per variant) under out_dir, across a process pool.
+
+    Cards whose RepoInfo did not change since the last run (per the
+    manifest) are skipped, and cards of repositories that no longer exist
+    are removed. `pool` (see _card_pool) is used instead of starting one of
+    `workers` processes, so batch runs can share it. Returns the number of
+    cards written.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    wanted: set[str] = set()
+    jobs = _card_jobs(repos, out_dir, manifest, optimize, wanted, variants)
+    _remove_stale_cards(out_dir, wanted, manifest)
+
+    workers = workers or os.cpu_count() or 1
+    if len(jobs) < 64 or workers == 1:
+        # Pool start-up costs more than rendering a handful of cards
+        for job in jobs:
+            _render_card_job(job)
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with _card_pool(workers) if pool is None else nullcontext(pool) as executor:
+            for _ in executor.map(_render_card_job, jobs, chunksize=chunksize):
+                pass
+
+    print(f"  → {len(jobs)} cards rendered, {len(wanted) - len(jobs)} unchanged")
+    return len(jobs)
+
+
+class _CardStream:
+    """render_repo_cards fed one repository page at a time.
+
+    Each page's changed cards go to the process pool as a single task while
+    the next page is still being fetched; finish() waits for them and
+    removes the cards of repositories that no longer exist. A shared `pool`
+    is used but never shut down.
+    """
+
+    def __init__(
+        self,
+        out_dir: Path,
+        manifest: OutputManifest,
+        workers: int | None = None,
+        optimize: bool = False,
+        variants: Sequence[Variant] = (),
+        pool: Any = None,
+    ) -> None:
+        self.out_dir = out_dir
+        self.manifest = manifest
+        self.workers = workers or os.cpu_count() or 1
+        self.optimize = optimize
+        self.variants = variants
+        self.wanted: set[str] = set()
+        self.rendered = 0
+        self._owns_pool = pool is None and self.workers > 1
+        # Built up front, before the pipeline starts its fetch thread
+        self._pool: Any = _card_pool(self.workers) if self._owns_pool else pool
+        self._pending: list[Any] = []
+        out_dir.mkdir(parents=True, exist_ok=True)
+
+    def add(self, repos: list[RepoInfo]) -> None:
+        jobs = _card_jobs(repos, self.out_dir, self.manifest, self.optimize, self.wanted, self.variants)
+        if not jobs:
+            return
+        self.rendered += len(jobs)
+        if self._pool is None:
+            _render_card_batch(jobs)
+            return
+        self._pending.append(self._pool.submit(_render_card_batch, jobs))
+
+    def cancel(self) -> None:
+        for future in self._pending:
+            future.cancel()
+        if self._owns_pool:
+            self._pool.shutdown(cancel_futures=True)
+
+    def finish(self) -> int:
+        try:
+            for future in self._pending:
+                future.result()
+        finally:
+            self.cancel()
+        _remove_stale_cards(self.out_dir, self.wanted, self.manifest)
+        print(f"  → {self.rendered} cards rendered, {len(self.wanted) - self.rendered} unchanged")
+        return self.rendered
+
+
+def _escape_xml(text: str) -> str:
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&apos;")
+    )
+
+
+class ActivityStore:
+    """Columnar on-disk store of weekly commit counts per repository.
+
+    Layout under `directory`:
+      repos.json   repository names (index = column), and one [week, width]
+                   entry per stored week, where week is the ordinal of its Monday
+      counts.u16   the weekly blocks back to back, `width` uint16 counts each
+                   (repos added later only widen newer blocks)
+      totals.u32   last seen total_commits per repository
+
+    Each run adds the growth of total_commits since the previous run to the
+    current week, so trends build up without extra API calls; weeks before
+    the store existed read as zero. Reads go through mmap, at 2 bytes per
+    repo-week on disk.
+    """
+
+    MAX_COUNT = 0xFFFF
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.index_path = directory / "repos.json"
+        self.counts_path = directory / "counts.u16"
+        self.totals_path = directory / "totals.u32"
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        self.repos: list[str] = index.get("repos", [])
+        self.blocks: list[tuple[int, int]] = [tuple(b) for b in index.get("blocks", [])]
+        self._columns = {name: i for i, name in enumerate(self.repos)}
+
+    @staticmethod
+    def week_of(day: dt.date) -> int:
+        return (day - dt.timedelta(days=day.weekday())).toordinal()
+
+    @staticmethod
+    def _to_disk(values: array.array) -> bytes:
+        if sys.byteorder != "little":
+            values = array.array(values.typecode, values)
+            values.byteswap()
+        return values.tobytes()
+
+    @staticmethod
+    def _from_disk(typecode: str, blob: bytes) -> array.array:
+        values = array.array(typecode)
+        values.frombytes(blob)
+        if sys.byteorder != "little":
+            values.byteswap()
+        return values
+
+    def _block_offsets(self) -> list[int]:
+        offsets, total = [], 0
+        for _, width in self.blocks:
+            offsets.append(total)
+            total += width
+        return offsets
+
+    def record(self, repos: list[RepoInfo] | RepoTable, day: dt.date | None = None) -> None:
+        """Add each repo's commit growth since the last run to the current week"""
+        week = self.week_of(day or dt.datetime.now(dt.timezone.utc).date())
+        try:
+            totals = self._from_disk("I", self.totals_path.read_bytes())
+        except OSError:
+            totals = array.array("I")
+
+        for repo in repos:
+            if repo.name_with_owner not in self._columns:
+                self._columns[repo.name_with_owner] = len(self.repos)
+                self.repos.append(repo.name_with_owner)
+        width = len(self.repos)
+
+        current = array.array("H", bytes(2 * width))
+        offsets = self._block_offsets()
+        rewrite_from = sum(w for _, w in self.blocks)
+        if self.blocks and self.blocks[-1][0] == week:
+            # Same week as the previous run: merge into the last block
+            last_width = self.blocks[-1][1]
+            rewrite_from = offsets[-1]
+            with self.counts_path.open("rb") as fh:
+                fh.seek(2 * rewrite_from)
+                current[:last_width] = self._from_disk("H", fh.read(2 * last_width))
+            self.blocks[-1] = (week, width)
+        else:
+            self.blocks.append((week, width))
+
+        seen = len(totals)
+        totals.extend([0] * (width - seen))
+        for repo in repos:
+            col = self._columns[repo.name_with_owner]
+            if col >= seen:
+                # First sighting: its history predates the store, start from here
+                totals[col] = repo.total_commits
+                continue
+            delta = repo.total_commits - totals[col]
+            if delta > 0:
+                current[col] = min(self.MAX_COUNT, current[col] + delta)
+            totals[col] = max(0, repo.total_commits)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self.counts_path.open("r+b" if self.counts_path.exists() else "w+b") as fh:
+            fh.seek(2 * rewrite_from)
+            fh.write(self._to_disk(current))
+            fh.truncate()
+        self.totals_path.write_bytes(self._to_disk(totals))
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps({"repos": self.repos, "blocks": self.blocks}), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def series(self, names: Sequence[str], weeks: int = 26, day: dt.date | None = None) -> ActivitySeries:
+        """Weekly counts of `names` for the `weeks` weeks ending at `day`'s week, oldest first"""
+        width = len(self.repos)
+        counts = array.array("H", [0]) * (width * weeks)
+        digest = hashlib.sha256(f"{weeks}:{width}".encode())
+        if not self.blocks or not self.counts_path.exists() or self.counts_path.stat().st_size == 0:
+            return ActivitySeries(names, self._columns, weeks, counts, digest.hexdigest())
+
+        last_week = self.week_of(day or dt.datetime.now(dt.timezone.utc).date())
+        first_week = last_week - 7 * (weeks - 1)
+        with self.counts_path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for (week, block_width), offset in zip(self.blocks, self._block_offsets()):
+                if not first_week <= week <= last_week:
+                    continue
+                slot = (week - first_week) // 7
+                blob = mm[2 * offset : 2 * (offset + block_width)]
+                digest.update(f"{slot}:{block_width}:".encode())
+                digest.update(blob)
+                # Column c's row is counts[c * weeks : (c + 1) * weeks]; fill this week's slot of each
+                counts[slot : slot + weeks * block_width : weeks] = self._from_disk("H", blob)
+        return ActivitySeries(names, self._columns, weeks, counts, digest.hexdigest())
+
+
+class ActivitySeries:
+    """The window ActivityStore.series read: one row of `weeks` uint16 counts per stored repository.
+
+    Rows sit back to back in a single array in the store's column order, so
+    the window costs 2 bytes per repo-week; get() hands out memoryview rows
+    without copying. `digest` hashes the stored blocks the window was read
+    from, so renderers can tell whether the series changed without
+    expanding it.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        columns: dict[str, int],
+        weeks: int,
+        counts: array.array,
+        digest: str,
+    ) -> None:
+        self.names = names
+        self.weeks = weeks
+        self.digest = digest
+        self._columns = columns
+        self._rows = memoryview(counts)
+        self._empty = memoryview(array.array("H", bytes(2 * weeks)))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get(self, name: str) -> memoryview:
+        """Counts of `name`, oldest week first; zeros for a repository the store never saw"""
+        col = self._columns.get(name)
+        if col is None or (col + 1) * self.weeks > len(self._rows):
+            return self._empty
+        return self._rows[col * self.weeks : (col + 1) * self.weeks]
+
+    def weekly_totals(self) -> list[int]:
+        totals = [0] * self.weeks
+        for name in self.names:
+            for i, count in enumerate(self.get(name)):
+                totals[i] += count
+        return totals
+
+
+class ContributionCalendar:
+    """All-time day-level contribution counts, one packed file per year.
+
+    Layout under `directory`:
+      calendar.json  {"first": date, "last": date} of the stored range
+      <year>.u16     366 uint16 counts indexed by day of year (732 bytes)
+
+    The first update backfills from the account's creation; later ones
+    fetch only from the last stored day (which may have been partial) to
+    today, so a daily run asks for a window of a day or two. Range totals
+    come from cumulative sums built once per load.
+    """
+
+    MAX_COUNT = 0xFFFF
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.index_path = directory / "calendar.json"
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        self.first: dt.date | None = dt.date.fromisoformat(index["first"]) if index.get("first") else None
+        self.last: dt.date | None = dt.date.fromisoformat(index["last"]) if index.get("last") else None
+        self._years: dict[int, array.array] = {}
+        self._cumulative: array.array | None = None
+
+    def _year(self, year: int) -> array.array:
+        counts = self._years.get(year)
+        if counts is None:
+            try:
+                counts = ActivityStore._from_disk("H", (self.directory / f"{year}.u16").read_bytes())
+            except OSError:
+                counts = array.array("H", bytes(2 * 366))
+            self._years[year] = counts
+        return counts
+
+    def record(self, days: dict[dt.date, int]) -> None:
+        """Store (or overwrite) the given daily counts and widen the stored range"""
+        if not days:
+            return
+        touched: set[int] = set()
+        for day, count in days.items():
+            self._year(day.year)[day.timetuple().tm_yday - 1] = min(self.MAX_COUNT, max(0, count))
+            touched.add(day.year)
+
+        self.first = min(days) if self.first is None else min(self.first, min(days))
+        self.last = max(days) if self.last is None else max(self.last, max(days))
+        self._cumulative = None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        for year in touched:
+            (self.directory / f"{year}.u16").write_bytes(ActivityStore._to_disk(self._years[year]))
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps({"first": self.first.isoformat(), "last": self.last.isoformat()}), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    def update(self, transport: GraphQLTransport, username: str, today: dt.date | None = None) -> int:
+        """Fetch the days missing since the last update; returns how many were fetched"""
+        today = today or dt.datetime.now(dt.timezone.utc).date()
+        if self.last is None:
+            data = _graphql(transport, ACCOUNT_CREATED_QUERY, {"login": username})
+            created = (data.get("repositoryOwner") or {}).get("createdAt")
+            start = dt.datetime.fromisoformat(created.replace("Z", "+00:00")).date() if created else today
+        else:
+            start = min(self.last, today)
+        days = fetch_contribution_days(transport, username, start, today)
+        # Move `last` up to today even when the calendar stops short of it
+        days.setdefault(today, 0)
+        self.record(days)
+        return (today - start).days + 1
+
+    def counts(self, start: dt.date, end: dt.date) -> list[int]:
+        """Daily counts for start..end inclusive (zero outside the stored range)"""
+        result: list[int] = []
+        day = start
+        while day <= end:
+            stop = min(end, dt.date(day.year, 12, 31))
+            first = day.timetuple().tm_yday - 1
+            result.extend(self._year(day.year)[first : first + (stop - day).days + 1])
+            day = stop + dt.timedelta(days=1)
+        return result
+
+    def total(self, start: dt.date, end: dt.date) -> int:
+        """Contributions between start and end inclusive, in O(1) after the first call"""
+        if self.first is None or self.last is None:
+            return 0
+        start, end = max(start, self.first), min(end, self.last)
+        if start > end:
+            return 0
+        if self._cumulative is None:
+            running = 0
+            cumulative = array.array("Q", [0])
+            for count in self.counts(self.first, self.last):
+                running += count
+                cumulative.append(running)
+            self._cumulative = cumulative
+        offset = self.first.toordinal()
+        return self._cumulative[end.toordinal() - offset + 1] - self._cumulative[start.toordinal() - offset]
+
+    def digest(self) -> str:
+        """Changes whenever any stored day does"""
+        blob = hashlib.sha256(f"{self.first}:{self.last}".encode())
+        if self.first is not None and self.last is not None:
+            for year in range(self.first.year, self.last.year + 1):
+                blob.update(ActivityStore._to_disk(self._year(year)))
+        return blob.hexdigest()
+
+
+class _SvgStream:
+    """Writes SVG lines straight to a file handle instead of joining them in memory"""
+
+    def __init__(self, fh: TextIO, separator: str = "\n") -> None:
+        self.fh = fh
+        self.separator = separator
+        self._started = False
+
+    def line(self, text: str) -> None:
+        if self._started:
+            self.fh.write(self.separator)
+        self.fh.write(text)
+        self._started = True
+
+
+SVG_FONT_STACK = "ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial"
+
+
+def _write_svgz(path: Path) -> Path:
+    """Write a gzip-precompressed copy next to path (mtime zeroed, so output is reproducible)"""
+    import gzip
+
+    svgz = path.with_suffix(".svgz")
+    svgz.write_bytes(gzip.compress(path.read_bytes(), compresslevel=9, mtime=0))
+    return svgz
+
+
+def _sparkline(values: Sequence[int], x: int, y: int, width: int, height: int, stroke: str, compact: bool = False) -> str:
+    peak = max(values) or 1
+    step = width / max(1, len(values) - 1)
+    if compact:
+        points = " ".join(f"{round(x + i * step)},{round(y + height - (v / peak) * height)}" for i, v in enumerate(values))
+        return f'<polyline points="{points}" class="p"/>'
+    points = " ".join(
+        f"{x + i * step:.1f},{y + height - (v / peak) * height:.1f}" for i, v in enumerate(values)
+    )
+    return (
+        f'<polyline points="{points}" fill="none" stroke="{stroke}" '
+        'stroke-width="2" stroke-linejoin="round" stroke-linecap="round"/>'
+    )
+
+
+def _overview_rows(username: str, table: RepoTable) -> list[int]:
+    # Filter out the profile repo itself and sort by commits (descending)
+    return table.order_by_commits(table.without_owner_repo(username))
+
+
+@dataclass(frozen=True, slots=True)
+class _OverviewLayout:
+    """The theme- and locale-independent part of an overview: ordered rows, bar scale and totals.
+
+    Labels and dates are formatted per row while writing, so a layout costs
+    no more than its row indices however many variants share it.
+    """
+
+    height: int
+    repo_count: int
+    total_commits: int
+    table: RepoTable
+    rows: Sequence[int]
+    max_commits: int
+
+
+def _overview_layout(
+    table: RepoTable,
+    rows: Sequence[int],
+    row_count: int,
+    repo_count: int,
+    total_commits: int,
+    max_commits: int,
+) -> _OverviewLayout:
+    padding = 24
+    row_h = 55
+    title_h = 55
+    return _OverviewLayout(
+        height=padding * 2 + title_h + row_h * row_count + 20,
+        repo_count=repo_count,
+        total_commits=total_commits,
+        table=table,
+        rows=rows,
+        max_commits=max_commits,
+    )
+
+
+def _format_pushed(iso: str | None, date_format: str) -> str:
+    if not iso:
+        return "—"
+    try:
+        return dt.datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime(date_format)
+    except ValueError:
+        return iso[:10]
+
+
+def _write_overview_svg(
+    out: _SvgStream,
+    username: str,
+    layout: _OverviewLayout,
+    page: tuple[int, int] | None = None,
+    activity: ActivitySeries | None = None,
+    compact: bool = False,
+    theme: Theme = DEFAULT_THEME,
+    locale: Locale = DEFAULT_LOCALE,
+) -> None:
+    """Write the overview document; compact swaps repeated attributes for
+    shared CSS classes and a <symbol> bar track, with no whitespace"""
+    width = 900
+    padding = 24
+    row_h = 55
+    title_h = 55
+    height = layout.height
+
+    text = theme.text
+    muted = theme.muted
+    bar_secondary = theme.bar_secondary
+    bar_bg = theme.bar_bg
+    
+    if compact:
+        out.line(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">')
+        out.line(
+            f'<defs><linearGradient id="g"><stop offset="0" stop-color="{theme.bar}"/><stop offset="1" stop-color="{bar_secondary}"/></linearGradient>'
+            f'<symbol id="k" overflow="visible"><rect width="280" height="14" rx="7" fill="{bar_bg}"/></symbol></defs>'
+        )
+        out.line(
+            f"<style>text{{font-family:{SVG_FONT_STACK}}}"
+            f".h{{font-size:20px;font-weight:700;fill:{text}}}.u{{font-size:13px;font-weight:500;fill:{muted}}}"
+            f".n{{font-size:16px;font-weight:700;fill:{text}}}.s{{font-size:13px;font-weight:600;fill:{muted}}}"
+            f".b{{fill:url(#g)}}.p{{fill:none;stroke:{bar_secondary};stroke-width:2;stroke-linejoin:round;stroke-linecap:round}}</style>"
+        )
+        out.line(f'<rect width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>')
+        out.line(f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.card}"/>')
+    else:
+        _write_overview_header(out, width, height, theme)
+    
+    # Title
+    title = locale.overview_title
+    subtitle = locale.overview_subtitle.format(username=username, repos=layout.repo_count, commits=layout.total_commits)
+    if page:
+        subtitle += " • " + locale.page_label.format(page=page[0], pages=page[1])
+    title_class, sub_class, title_fill, sub_fill = ("h", "u", "", "") if compact else ("title", "sub", f' fill="{text}"', f' fill="{muted}"')
+    out.line(f'<text x="{padding}" y="{padding + 20}" class="{title_class}"{title_fill}>{_escape_xml(title)}</text>')
+    out.line(f'<text x="{padding}" y="{padding + 42}" class="{sub_class}"{sub_fill}>{_escape_xml(subtitle)}</text>')
+    
+    start_y = padding + title_h + 15
+    bar_x = padding + 260
+    unit = locale.commits_unit
+    date_format = locale.short_date
+    
+    table = layout.table
+    names, stars_column, pushed_at, commit_counts = table.names, table.stars, table.pushed_at, table.commits
+    max_commits = layout.max_commits
+    for i, row in enumerate(layout.rows):
+        y = start_y + i * row_h
+        name_with_owner = names[row]
+        commits = commit_counts[row]
+        stars = stars_column[row]
+        # int() truncates, which equals floor for the non-negative counts here
+        bar_width = int((commits / max_commits) * 280) if max_commits > 0 else 0
+        repo_name = name_with_owner.split('/')[-1]
+        label = _escape_xml(repo_name if len(repo_name) <= 30 else repo_name[:27] + "...")
+        pushed = _format_pushed(pushed_at[row], date_format)
+        sparkline = activity.get(name_with_owner) if activity is not None else None
+
+        if compact:
+            out.line(f'<text x="{padding}" y="{y + 10}" class="n">📦 {label}</text>')
+            out.line(f'<use href="#k" x="{bar_x}" y="{y - 2}"/>')
+            if bar_width > 0:
+                out.line(f'<rect x="{bar_x}" y="{y - 2}" width="{bar_width}" height="14" rx="7" class="b"/>')
+            out.line(
+                f'<text y="{y + 28}" class="s"><tspan x="{bar_x}">💬 {commits} {unit}</tspan>'
+                f'<tspan x="{bar_x + 100}">⭐ {stars}</tspan><tspan x="{bar_x + 170}">📅 {pushed}</tspan></text>'
+            )
+            if sparkline is not None:
+                out.line(_sparkline(sparkline, padding + 580, y - 4, 260, 26, bar_secondary, compact=True))
+            continue
+        
+        # Repo name (left) - MAIOR e mais DESTACADO
+        out.line(f'<text x="{padding}" y="{y + 10}" class="repo-name" fill="{text}">📦 {label}</text>')
+        
+        # Commits bar (center)
+        bar_y = y - 2
+        out.line(f'<rect x="{bar_x}" y="{bar_y}" width="280" height="14" rx="7" fill="{bar_bg}"/>')
+        if bar_width > 0:
+            out.line(f'<rect x="{bar_x}" y="{bar_y}" width="{bar_width}" height="14" rx="7" fill="url(#barGradient)"/>')
+        
+        # Stats (right side - below bar)
+        stats_y = y + 28
+        out.line(f'<text x="{bar_x}" y="{stats_y}" class="stat" fill="{muted}">💬 {commits} {unit}</text>')
+        out.line(f'<text x="{bar_x + 100}" y="{stats_y}" class="stat" fill="{muted}">⭐ {stars}</text>')
+        out.line(f'<text x="{bar_x + 170}" y="{stats_y}" class="stat" fill="{muted}">📅 {pushed}</text>')
+
+        # Weekly activity sparkline (right)
+        if sparkline is not None:
+            out.line(_sparkline(sparkline, padding + 580, y - 4, 260, 26, bar_secondary))
+    
+    out.line("</svg>")
+
+
+def _write_overview_header(out: _SvgStream, width: int, height: int, theme: Theme) -> None:
+    for part in (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">',
+        "<defs>",
+        '<linearGradient id="barGradient" x1="0%" y1="0%" x2="100%" y2="0%">',
+        f'  <stop offset="0%" style="stop-color:{theme.bar};stop-opacity:1" />',
+        f'  <stop offset="100%" style="stop-color:{theme.bar_secondary};stop-opacity:1" />',
+        '</linearGradient>',
+        "</defs>",
+        "<style>",
+        ".title{font:700 20px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
+        ".sub{font:500 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
+        ".repo-name{font:700 16px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
+        ".stat{font:600 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}",
+        "</style>",
+        f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>',
+        f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.card}"/>',
+    ):
+        out.line(part)
+
+
+def _write_empty_overview_svg(out: _SvgStream, theme: Theme = DEFAULT_THEME, locale: Locale = DEFAULT_LOCALE) -> None:
+    width = 900
+    padding = 24
+    height = 200
+
+    out.line(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">')
+    out.line(f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>')
+    out.line(f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.card}"/>')
+    out.line(f'<text x="{padding}" y="80" fill="{theme.text}" font-family="ui-sans-serif,system-ui" font-size="18" font-weight="700">{_escape_xml(locale.no_repos)}</text>')
+    out.line("</svg>")
+
+
+def _write_overview_file(
+    path: Path,
+    username: str,
+    layout: _OverviewLayout | None,
+    variant: Variant | None,
+    page: tuple[int, int] | None = None,
+    activity: ActivitySeries | None = None,
+    optimize: bool = False,
+) -> Path:
+    """Serialize a shared layout (None: no repositories) as `variant`, or the default look"""
+    theme, locale = (DEFAULT_THEME, DEFAULT_LOCALE) if variant is None else (variant.theme, variant.locale)
+    with path.open("w", encoding="utf-8") as fh:
+        out = _SvgStream(fh, "" if optimize else "\n")
+        if layout is None:
+            _write_empty_overview_svg(out, theme, locale)
+        else:
+            _write_overview_svg(out, username, layout, page, activity, optimize, theme, locale)
+    if optimize:
+        _write_svgz(path)
+    return path
+
+
+def render_combined_repos_svg(
+    username: str,
+    repos: list[RepoInfo] | RepoTable,
+    out_path: Path,
+    activity: ActivitySeries | None = None,
+    optimize: bool = False,
+    variants: Sequence[Variant] = (),
+) -> None:
+    """Generate a beautiful combined SVG showing all repos with commits, stars, and dates
+
+    With `activity` (see ActivityStore.series), each row also gets a sparkline
+    of its weekly commits. With `optimize`, the compact markup is written and
+    a gzip-precompressed .svgz is placed next to the file. Each of `variants`
+    is written next to out_path from the same sorted, scaled layout.
+    """
+    table = RepoTable.coerce(repos)
+    filtered = _overview_rows(username, table)
+    layout = None
+    if filtered:
+        layout = _overview_layout(
+            table,
+            filtered,
+            row_count=len(filtered),
+            repo_count=len(filtered),
+            total_commits=table.total_commits(filtered),
+            max_commits=table.commits[filtered[0]],
+        )
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    for variant in (None, *variants):
+        _write_overview_file(_variant_path(out_path, variant), username, layout, variant, activity=activity, optimize=optimize)
+    _remove_stale_variants(out_path, variants)
+    if not filtered:
+        return
+
+    print(f"  → Generated combined SVG with {len(filtered)} repositories")
+    print(f"  → File size: {out_path.stat().st_size} bytes")
+    if variants:
+        print(f"  → {len(variants)} variants written from the same layout")
+
+
+def render_paged_repos_svg(
+    username: str,
+    repos: list[RepoInfo] | RepoTable,
+    out_dir: Path,
+    page_size: int = 50,
+    stem: str = "repos-overview",
+    activity: ActivitySeries | None = None,
+    optimize: bool = False,
+    variants: Sequence[Variant] = (),
+) -> list[Path]:
+    """Split the combined overview into fixed-height pages plus a Markdown index.
+
+    Every page has room for page_size rows and bars share one scale, so
+    pages line up and stay comparable. Each of `variants` gets its own
+    <stem>-<theme>-<locale>-<n>.svg pages from the same per-page layout.
+    Returns the default page paths in order.
+    """
+    table = RepoTable.coerce(repos)
+    filtered = _overview_rows(username, table)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    total_commits = table.total_commits(filtered)
+    max_commits = table.commits[filtered[0]] if filtered else 0
+    page_count = max(1, math.ceil(len(filtered) / page_size))
+
+    pages: list[Path] = []
+    for page in range(page_count):
+        layout = None
+        if filtered:
+            layout = _overview_layout(
+                table,
+                filtered[page * page_size : (page + 1) * page_size],
+                row_count=page_size,
+                repo_count=len(filtered),
+                total_commits=total_commits,
+                max_commits=max_commits,
+            )
+        for variant in (None, *variants):
+            variant_stem = stem if variant is None else stem + variant.suffix
+            path = _write_overview_file(
+                out_dir / f"{variant_stem}-{page + 1}.svg",
+                username,
+                layout,
+                variant,
+                page=(page + 1, page_count),
+                activity=activity,
+                optimize=optimize,
+            )
+            if variant is None:
+                pages.append(path)
+
+    # Drop pages left over from a run that had more repositories
+    for variant in (None, *variants):
+        variant_stem = stem if variant is None else stem + variant.suffix
+        stale = page_count + 1
+        while (out_dir / f"{variant_stem}-{stale}.svg").exists():
+            (out_dir / f"{variant_stem}-{stale}.svg").unlink()
+            (out_dir / f"{variant_stem}-{stale}.svgz").unlink(missing_ok=True)
+            stale += 1
+    for variant in _unwanted_variants(variants):
+        for path in out_dir.glob(f"{stem}{variant.suffix}-*.svg*"):
+            path.unlink()
+
+    index_path = out_dir / f"{stem}-index.md"
+    with index_path.open("w", encoding="utf-8") as fh:
+        fh.write(f"# Repositórios ({username})\n\n")
+        for page, path in enumerate(pages, 1):
+            fh.write(f'<img src="{path.name}" alt="Repositórios — página {page}" width="100%" />\n\n')
+
+    print(f"  → Generated {len(pages)} overview pages with {len(filtered)} repositories")
+    return pages
+
+
+@dataclass(frozen=True, slots=True)
+class _CommitsLayout:
+    """Rows of the commits chart with their bar widths, shared by every variant"""
+
+    height: int
+    labels: list[str]
+    counts: list[int]
+    bar_widths: list[int]
+
+
+def _commits_layout(table: RepoTable, rows: list[int]) -> _CommitsLayout:
+    padding = 24
+    row_h = 28
+    title_h = 42
+
+    labels: list[str] = []
+    for row in rows:
+        repo_label = table.names[row]
+        if len(repo_label) > 36:
+            repo_label = "…" + repo_label[-35:]
+        labels.append(_escape_xml(repo_label))
+
+    max_value = max((table.commits[i] for i in rows), default=1)
+    return _CommitsLayout(
+        height=padding * 2 + title_h + row_h * len(rows) + 10,
+        labels=labels,
+        counts=[table.commits[row] for row in rows],
+        bar_widths=table.bar_widths(rows, 420, max_value),
+    )
+
+
+def _write_commits_svg(
+    out: _SvgStream,
+    username: str,
+    period_label: str,
+    layout: _CommitsLayout,
+    compact: bool = False,
+    theme: Theme = DEFAULT_THEME,
+    locale: Locale = DEFAULT_LOCALE,
+) -> None:
+    width = 900
+    padding = 24
+    row_h = 28
+    title_h = 42
+    bar_h = 10
+    title = locale.commits_title.format(period=period_label)
+
+    # If no stats, render a placeholder card
+    if not layout.labels:
+        height = 180
+        
+        for part in (
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">',
+            f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{theme.empty_bg}"/>',
+            f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.empty_card}"/>',
+            f'<text x="{padding}" y="60" fill="{theme.empty_text}" font-family="ui-sans-serif,system-ui" font-size="18" font-weight="700">{_escape_xml(title)}</text>',
+            f'<text x="{padding}" y="90" fill="{theme.empty_muted}" font-family="ui-sans-serif,system-ui" font-size="14">{_escape_xml(locale.no_commits)}</text>',
+            f'<text x="{padding}" y="120" fill="{theme.empty_muted}" font-family="ui-sans-serif,system-ui" font-size="13">{_escape_xml(locale.no_commits_hint)}</text>',
+            "</svg>"
+        ):
+            out.line(part)
+        return
+    
+    height = layout.height
+    subtitle = locale.commits_subtitle.format(username=username, rows=len(layout.labels))
+
+    text = theme.text
+    muted = theme.muted
+    bar = theme.bar
+    bar_secondary = theme.bar_secondary
+    bar_bg = theme.bar_bg
+
+    out.line(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">')
+
+    if compact:
+        out.line(
+            f'<defs><linearGradient id="g"><stop offset="0" stop-color="{bar}"/><stop offset="1" stop-color="{bar_secondary}"/></linearGradient>'
+            f'<symbol id="k" overflow="visible"><rect width="420" height="{bar_h}" rx="5" fill="{bar_bg}"/></symbol></defs>'
+        )
+        out.line(
+            f"<style>text{{font-family:{SVG_FONT_STACK}}}"
+            f".h{{font-size:18px;font-weight:700;fill:{text}}}.u{{font-size:12px;font-weight:500;fill:{muted}}}"
+            f".l{{font-size:12px;font-weight:600;fill:{text}}}.c{{font-size:13px;font-weight:700;fill:{muted}}}"
+            ".b{fill:url(#g)}</style>"
+        )
+        out.line(f'<rect width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>')
+        out.line(f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.card}"/>')
+        out.line(f'<text x="{padding}" y="{padding + 18}" class="h">{_escape_xml(title)}</text>')
+        out.line(f'<text x="{padding}" y="{padding + 38}" class="u">{_escape_xml(subtitle)}</text>')
+
+        start_y = padding + title_h + 16
+        bar_x = padding + 320
+        for i, (label, count, bar_width) in enumerate(zip(layout.labels, layout.counts, layout.bar_widths)):
+            y = start_y + i * row_h
+            out.line(f'<text x="{padding}" y="{y}" class="l">{label}</text>')
+            out.line(f'<use href="#k" x="{bar_x}" y="{y - 10}"/>')
+            out.line(f'<rect x="{bar_x}" y="{y - 10}" width="{bar_width}" height="{bar_h}" rx="5" class="b"/>')
+            out.line(f'<text x="{bar_x + 430}" y="{y}" class="c">{count}</text>')
+        out.line("</svg>")
+        return
+    
+    # Add gradient definitions
+    out.line("<defs>")
+    out.line(f'<linearGradient id="barGradient" x1="0%" y1="0%" x2="100%" y2="0%">')
+    out.line(f'  <stop offset="0%" style="stop-color:{bar};stop-opacity:1" />')
+    out.line(f'  <stop offset="100%" style="stop-color:{bar_secondary};stop-opacity:1" />')
+    out.line('</linearGradient>')
+    out.line("</defs>")
+    
+    out.line("<style>")
+    out.line(
+        ".title{font:700 18px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+        ".sub{font:500 12px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+        ".label{font:600 12px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+        ".count{font:700 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+    )
+    out.line("</style>")
+
+    out.line(f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>')
+    out.line(f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.card}"/>')
+
+    out.line(f'<text x="{padding}" y="{padding + 18}" class="title" fill="{text}">{_escape_xml(title)}</text>')
+    out.line(f'<text x="{padding}" y="{padding + 38}" class="sub" fill="{muted}">{_escape_xml(subtitle)}</text>')
+
+    start_y = padding + title_h + 16
+    for i, (label, count, bar_width) in enumerate(zip(layout.labels, layout.counts, layout.bar_widths)):
+        y = start_y + i * row_h
+
+        out.line(f'<text x="{padding}" y="{y}" class="label" fill="{text}">{label}</text>')
+
+        bar_x = padding + 320
+        bar_y = y - 10
+        out.line(f'<rect x="{bar_x}" y="{bar_y}" width="420" height="{bar_h}" rx="5" fill="{bar_bg}"/>')
+        out.line(f'<rect x="{bar_x}" y="{bar_y}" width="{bar_width}" height="{bar_h}" rx="5" fill="url(#barGradient)"/>')
+
+        out.line(
+            f'<text x="{bar_x + 430}" y="{y}" class="count" fill="{muted}">{count}</text>'
+        )
+
+    out.line("</svg>")
+
+
+def render_commits_svg(
+    username: str,
+    period_label: str,
+    stats: Iterable[RepoCommitStat] | RepoTable,
+    out_path: Path,
+    max_rows: int = 15,
+    optimize: bool = False,
+    variants: Sequence[Variant] = (),
+    period_days: int | None = None,
+) -> None:
+    """Chart the top `max_rows` repositories by commits.
+
+    Each of `variants` is written next to out_path from the same layout.
+    Variants in the default locale keep `period_label`; the others describe
+    `period_days` in their own language (or fall back to `period_label`).
+    """
+    if isinstance(stats, RepoTable):
+        table = stats
+        rows = table.top_by_commits(max_rows)
+    else:
+        # Only the top rows are drawn, so only they are copied into a table;
+        # nlargest keeps max_rows items, so `stats` may be a generator of any length
+        table = RepoTable.from_commit_stats(heapq.nlargest(max_rows, stats, key=lambda s: s.commit_contributions))
+        rows = list(range(len(table)))
+    layout = _commits_layout(table, rows)
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    for variant in (None, *variants):
+        theme, locale = (DEFAULT_THEME, DEFAULT_LOCALE) if variant is None else (variant.theme, variant.locale)
+        label = period_label
+        if locale != DEFAULT_LOCALE and period_days is not None:
+            label = locale.period(period_days)
+        path = _variant_path(out_path, variant)
+        with path.open("w", encoding="utf-8") as fh:
+            _write_commits_svg(_SvgStream(fh, "" if optimize else "\n"), username, label, layout, optimize, theme, locale)
+        if optimize:
+            _write_svgz(path)
+    _remove_stale_variants(out_path, variants)
+
+    if rows:
+        print(f"  → Generated SVG with {len(rows)} repositories")
+        print(f"  → File size: {out_path.stat().st_size} bytes")
+
+
+def render_top_repos_svg(
+    transport: GraphQLTransport,
+    username: str,
+    out_path: Path,
+    max_rows: int = 15,
+    optimize: bool = False,
+    locale: Locale = DEFAULT_LOCALE,
+) -> RepoAggregate:
+    """Stream every repository page into a top-`max_rows` commits chart.
+
+    Pages are consumed as they arrive and dropped, so peak memory is one
+    page plus `max_rows` repositories, independent of the account's size.
+    Returns the aggregate with the repository count and totals.
+    """
+    aggregate = RepoAggregate(max_rows).consume(iter_repositories(transport, username))
+    render_commits_svg(
+        username,
+        locale.all_time,
+        (RepoCommitStat(r.name_with_owner, r.url, r.total_commits) for r in aggregate.top()),
+        out_path,
+        max_rows=max_rows,
+        optimize=optimize,
+    )
+    return aggregate
+
+
+@dataclass(frozen=True, slots=True)
+class _HeatmapLayout:
+    """Cells and totals of the heatmap, shared by every variant"""
+
+    height: int
+    total: int
+    since: dt.date
+    # (year, contributions, label y, [(x, y, level), ...]) newest year first
+    years: list[tuple[int, int, int, list[tuple[int, int, int]]]]
+
+
+_HEAT_CELL = 10
+_HEAT_STEP = 13
+
+
+def _heatmap_layout(calendar: ContributionCalendar, years: int | None = None) -> _HeatmapLayout | None:
+    if calendar.first is None or calendar.last is None:
+        return None
+    padding = 24
+    title_h = 55
+    band_h = 22 + 7 * _HEAT_STEP + 12
+
+    last_year = calendar.last.year
+    first_year = calendar.first.year if years is None else max(calendar.first.year, last_year - years + 1)
+    spans = []
+    for year in range(last_year, first_year - 1, -1):
+        start = max(dt.date(year, 1, 1), calendar.first)
+        end = min(dt.date(year, 12, 31), calendar.last)
+        spans.append((year, start, end, calendar.counts(start, end)))
+
+    # Quartiles of the active days pick the four shades, so one busy day
+    # does not wash out the rest of the grid
+    active = sorted(c for *_, counts in spans for c in counts if c)
+    thresholds = [active[len(active) * q // 4] for q in (1, 2, 3)] if active else []
+
+    bands = []
+    for band, (year, start, end, counts) in enumerate(spans):
+        top = padding + title_h + band * band_h + 22
+        jan1_row = (dt.date(year, 1, 1).weekday() + 1) % 7  # Sunday-first rows
+        offset = (start - dt.date(year, 1, 1)).days
+        cells = []
+        for i, count in enumerate(counts):
+            day = offset + i
+            column, row = divmod(day + jan1_row, 7)
+            level = bisect.bisect_left(thresholds, count) + 1 if count else 0
+            cells.append((padding + column * _HEAT_STEP, top + row * _HEAT_STEP, level))
+        bands.append((year, calendar.total(start, end), top - 8, cells))
+
+    return _HeatmapLayout(
+        height=padding * 2 + title_h + band_h * len(bands),
+        total=calendar.total(calendar.first, calendar.last),
+        since=calendar.first,
+        years=bands,
+    )
+
+
+def _write_heatmap_svg(
+    out: _SvgStream,
+    username: str,
+    layout: _HeatmapLayout,
+    compact: bool = False,
+    theme: Theme = DEFAULT_THEME,
+    locale: Locale = DEFAULT_LOCALE,
+) -> None:
+    width = 24 * 2 + 54 * _HEAT_STEP
+    padding = 24
+    height = layout.height
+    cell = _HEAT_CELL
+    subtitle = locale.heatmap_subtitle.format(
+        username=username, total=layout.total, since=layout.since.strftime(locale.long_date)
+    )
+
+    out.line(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" role="img">')
+    if compact:
+        symbols = "".join(
+            f'<symbol id="h{level}" overflow="visible"><rect width="{cell}" height="{cell}" rx="2" fill="{color}"/></symbol>'
+            for level, color in enumerate(theme.heat)
+        )
+        out.line(f"<defs>{symbols}</defs>")
+        out.line(
+            f"<style>text{{font-family:{SVG_FONT_STACK}}}"
+            f".h{{font-size:20px;font-weight:700;fill:{theme.text}}}.u{{font-size:13px;font-weight:500;fill:{theme.muted}}}"
+            f".y{{font-size:13px;font-weight:600;fill:{theme.muted}}}</style>"
+        )
+        out.line(f'<rect width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>')
+    else:
+        out.line("<style>")
+        out.line(
+            ".title{font:700 20px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+            ".sub{font:500 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+            ".year{font:600 13px ui-sans-serif,system-ui,-apple-system,Segoe UI,Roboto,Arial;}"
+        )
+        out.line("</style>")
+        out.line(f'<rect x="0" y="0" width="{width}" height="{height}" rx="14" fill="{theme.bg}"/>')
+    out.line(f'<rect x="12" y="12" width="{width-24}" height="{height-24}" rx="12" fill="{theme.card}"/>')
+
+    title_class, sub_class, year_class = ("h", "u", "y") if compact else ("title", "sub", "year")
+    title_fill, muted_fill = ("", "") if compact else (f' fill="{theme.text}"', f' fill="{theme.muted}"')
+    out.line(f'<text x="{padding}" y="{padding + 20}" class="{title_class}"{title_fill}>{_escape_xml(locale.heatmap_title)}</text>')
+    out.line(f'<text x="{padding}" y="{padding + 42}" class="{sub_class}"{muted_fill}>{_escape_xml(subtitle)}</text>')
+
+    heat = theme.heat
+    for year, total, label_y, cells in layout.years:
+        label = _escape_xml(locale.heatmap_year.format(year=year, total=total))
+        out.line(f'<text x="{padding}" y="{label_y}" class="{year_class}"{muted_fill}>{label}</text>')
+        for x, y, level in cells:
+            if compact:
+                out.line(f'<use href="#h{level}" x="{x}" y="{y}"/>')
+            else:
+                out.line(f'<rect x="{x}" y="{y}" width="{cell}" height="{cell}" rx="2" fill="{heat[level]}"/>')
+    out.line("</svg>")
+
+
+def render_contribution_heatmap_svg(
+    username: str,
+    calendar: ContributionCalendar,
+    out_path: Path,
+    years: int | None = None,
+    optimize: bool = False,
+    variants: Sequence[Variant] = (),
+) -> bool:
+    """Draw one GitHub-style year grid per stored year (the newest `years` when set).
+
+    Returns False, writing nothing, while the calendar is still empty.
+    """
+    layout = _heatmap_layout(calendar, years)
+    if layout is None:
+        return False
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    for variant in (None, *variants):
+        theme, locale = (DEFAULT_THEME, DEFAULT_LOCALE) if variant is None else (variant.theme, variant.locale)
+        path = _variant_path(out_path, variant)
+        with path.open("w", encoding="utf-8") as fh:
+            _write_heatmap_svg(_SvgStream(fh, "" if optimize else "\n"), username, layout, optimize, theme, locale)
+        if optimize:
+            _write_svgz(path)
+    _remove_stale_variants(out_path, variants)
+
+    print(f"  → Generated heatmap with {len(layout.years)} years and {layout.total} contributions")
+    print(f"  → File size: {out_path.stat().st_size} bytes")
+    return True
+
+
+def _markdown_header(username: str) -> list[str]:
+    return [
+        f"# Repositórios ({username})",
+        "",
+        f"Atualizado automaticamente por GitHub Actions em {dt.datetime.now(dt.timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}.\n",
+        "| Repositório | Linguagem | Stars | Último push |",
+        "|---|---:|---:|---:|",
+    ]
+
+
+def _markdown_rows(
+    names: Iterable[str],
+    urls: Iterable[str],
+    languages: Iterable[str | None],
+    stars: Iterable[int],
+    pushed_at: Iterable[str | None],
+) -> Iterator[str]:
+    def fmt_date(iso: str | None) -> str:
+        if not iso:
+            return "—"
+        try:
+            return dt.datetime.fromisoformat(iso.replace("Z", "+00:00")).strftime("%Y-%m-%d")
+        except Exception:
+            return iso
+
+    for name, url, lang, star_count, pushed in zip(names, urls, languages, stars, pushed_at):
+        yield f"| [{name}]({url}) | {lang or '—'} | {star_count} | {fmt_date(pushed)} |"
+
+
+def render_repos_markdown(username: str, repos: list[RepoInfo] | RepoTable, out_path: Path) -> None:
+    table = RepoTable.coerce(repos)
+    lines = _markdown_header(username)
+    lines.extend(_markdown_rows(table.names, table.urls, table.languages, table.stars, table.pushed_at))
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class _MarkdownStream:
+    """render_repos_markdown written page by page as repositories arrive.
+
+    The table is in fetch order, so rows can go out immediately. They go to
+    a temp file, which finish() renames over out_path or, when the manifest
+    says the inputs did not change, throws away.
+    """
+
+    def __init__(self, username: str, out_path: Path) -> None:
+        self.out_path = out_path
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp = out_path.with_name(out_path.name + ".tmp")
+        self._fh = self._tmp.open("w", encoding="utf-8")
+        self._fh.writelines(line + "\n" for line in _markdown_header(username))
+
+    def add(self, repos: list[RepoInfo]) -> None:
+        self._fh.writelines(
+            row + "\n"
+            for row in _markdown_rows(
+                (r.name_with_owner for r in repos),
+                (r.url for r in repos),
+                (r.primary_language for r in repos),
+                (r.stars for r in repos),
+                (r.pushed_at for r in repos),
+            )
+        )
+
+    def discard(self) -> None:
+        self._fh.close()
+        self._tmp.unlink(missing_ok=True)
+
+    def finish(self, manifest: OutputManifest, key: str, digest: str) -> bool:
+        if manifest.is_current(key, digest, self.out_path):
+            self.discard()
+            print(f"  → {key} unchanged, skipped")
+            return False
+        self._fh.close()
+        os.replace(self._tmp, self.out_path)
+        manifest.record(key, digest)
+        return True
+
+
+@dataclass(frozen=True)
+class ReadmeContext:
+    """Everything a README section renderer may draw from"""
+
+    username: str
+    repos: RepoTable
+    stats: list[RepoCommitStat] | None = None
+    activity: ActivitySeries | None = None
+
+
+ReadmeRenderer = Callable[[ReadmeContext], str]
+
+# Section name -> renderer; the README delimits each section with
+# <!-- NAME:START --> ... <!-- NAME:END -->
+README_SECTIONS: dict[str, ReadmeRenderer] = {}
+
+_README_SECTION_RE = re.compile(r"(<!-- ([A-Z0-9_-]+):START -->)(.*?)(<!-- \2:END -->)", re.DOTALL)
+
+
+def readme_section(name: str) -> Callable[[ReadmeRenderer], ReadmeRenderer]:
+    """Register the decorated function as the renderer of README section `name`"""
+
+    def register(renderer: ReadmeRenderer) -> ReadmeRenderer:
+        README_SECTIONS[name] = renderer
+        return renderer
+
+    return register
+
+
+@readme_section("REPOS-LIST")
+def _readme_updated_at(ctx: ReadmeContext) -> str:
     # Render combined repos (no need for separate cards since we have the overview SVG)
-    lines: list[str] = []
-    lines.append(start_marker)
-    lines.append("")
-    lines.append(f"<p align='center'><em>📅 Atualizado em {dt.datetime.now(dt.timezone.utc).strftime('%d/%m/%Y às %H:%M UTC')}</em></p>")
-    lines.append("")
-    lines.append(end_marker)
+    return f"<p align='center'><em>📅 Atualizado em {dt.datetime.now(dt.timezone.utc).strftime('%d/%m/%Y às %H:%M UTC')}</em></p>"
+
+
+@readme_section("REPOS-STATS")
+def _readme_stats(ctx: ReadmeContext) -> str:
+    table = ctx.repos
+    rows = table.without_owner_repo(ctx.username)
+    commits = table.total_commits(rows)
+    stars = sum(table.stars[i] for i in rows)
+    return f"<p align='center'><b>{len(rows)}</b> repositórios • <b>{commits}</b> commits • <b>{stars}</b> ⭐</p>"
+
+
+@readme_section("TOP-REPOS")
+def _readme_top_repos(ctx: ReadmeContext, limit: int = 10) -> str:
+    if ctx.stats is not None:
+        rows = [(s.name_with_owner, s.url, s.commit_contributions) for s in ctx.stats]
+        top = heapq.nlargest(limit, rows, key=lambda row: row[2])
+    else:
+        table = ctx.repos
+        top_rows = table.top_by_commits(limit, table.without_owner_repo(ctx.username))
+        top = [(table.names[i], table.urls[i], table.commits[i]) for i in top_rows]
+    if not top:
+        return "_Nenhum repositório com commits._"
+    return "\n".join(f"{i}. [{name}]({url}) — {commits} commits" for i, (name, url, commits) in enumerate(top, 1))
+
+
+@readme_section("ACTIVITY")
+def _readme_activity(ctx: ReadmeContext) -> str:
+    if not ctx.activity:
+        return "_Sem dados de atividade semanal._"
+    weeks = ctx.activity.weekly_totals()
+    peak = max(weeks) or 1
+    blocks = "▁▂▃▄▅▆▇█"
+    bars = "".join(blocks[min(len(blocks) - 1, w * len(blocks) // (peak + 1))] for w in weeks)
+    return f"<p align='center'><code>{bars}</code><br/><em>{sum(weeks)} commits nas últimas {len(weeks)} semanas</em></p>"
+
+
+def _find_readme() -> Path:
+    readme_candidates = [ROOT / "README.md", ROOT / "Readme.md"]
+    readme_path = next((p for p in readme_candidates if p.exists()), None)
+    if not readme_path:
+        raise RuntimeError("README not found (expected README.md or Readme.md)")
+    return readme_path
+
+
+def render_readme_sections(content: str, ctx: ReadmeContext, renderers: dict[str, ReadmeRenderer]) -> tuple[str, list[str]]:
+    """Replace the body of every registered marker section in a single pass.
+
+    Sections without a renderer are left untouched, as is everything outside
+    the markers. Returns the new content and the names of the sections rendered.
+    """
+    rendered: list[str] = []
+
+    def replace(match: re.Match[str]) -> str:
+        start, name, body, end = match.groups()
+        renderer = renderers.get(name)
+        if renderer is None:
+            return match.group(0)
+        rendered.append(name)
+        return f"{start}\n\n{renderer(ctx)}\n\n{end}"
+
+    return _README_SECTION_RE.sub(replace, content), rendered
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    # Write next to the target and rename over it, so readers (and a crash
+    # mid-write) only ever see the old or the new file
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8", newline="") as fh:
+            fh.write(text)
+            fh.flush()
+            os.fsync(fh.fileno())
+        try:
+            os.chmod(tmp, path.stat().st_mode & 0o777)
+        except OSError:
+            pass
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def update_readme_sections(
+    ctx: ReadmeContext,
+    readme_path: Path | None = None,
+    renderers: dict[str, ReadmeRenderer] | None = None,
+) -> list[str]:
+    """Render every registered section found in the README and replace the file atomically"""
+    readme_path = readme_path or _find_readme()
+    renderers = README_SECTIONS if renderers is None else renderers
+    content = readme_path.read_text(encoding="utf-8")
+
+    print(f"📖 Reading {readme_path.name} ({len(content)} chars)...")
+    updated, rendered = render_readme_sections(content, ctx, renderers)
+    if not rendered:
+        print("\n❌ No known section markers found!")
+        for i, line in enumerate(content.splitlines(), 1):
+            if ":START -->" in line or ":END -->" in line:
+                print(f"   Line {i}: {line!r}")
+        known = ", ".join(f"<!-- {name}:START -->" for name in renderers)
+        raise RuntimeError(f"No section markers found in README. Add one of: {known}")
+
+    print(f"   Sections: {', '.join(rendered)}")
+    if updated != content:
+        _atomic_write_text(readme_path, updated)
+    return rendered
+
+
+def update_readme_repo_section(username: str, repos: list[RepoInfo] | RepoTable, readme_path: Path | None = None) -> None:
+    update_readme_sections(ReadmeContext(username, RepoTable.coerce(repos)), readme_path=readme_path)
+
+
+class OutputManifest:
+    """Hashes of the inputs each generated output was last rendered from.
+
+    Stored as JSON next to the outputs (and committed with them), so a run
+    whose data did not change skips the renderer entirely: no CPU, no write,
+    and no new timestamp in repositories.md or the README.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        try:
+            self.entries: dict[str, str] = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+        self._dirty = False
+
+    def is_current(self, key: str, digest: str, output: Path | Sequence[Path] | None = None) -> bool:
+        """True when `key` was rendered from `digest` and every output file still exists"""
+        outputs = [output] if isinstance(output, Path) else output or []
+        if not all(path.exists() for path in outputs):
+            return False
+        return self.entries.get(key) == digest
+
+    def record(self, key: str, digest: str) -> None:
+        if self.entries.get(key) != digest:
+            self.entries[key] = digest
+            self._dirty = True
+
+    def forget(self, key: str) -> None:
+        if self.entries.pop(key, None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        self._dirty = False
+
+
+_renderer_fingerprint: str | None = None
+
+
+def _input_digest(*inputs: Any) -> str:
+    """Stable hash of renderer inputs; includes this script so template edits re-render"""
+    global _renderer_fingerprint
+    if _renderer_fingerprint is None:
+        _renderer_fingerprint = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+    def default(obj: Any) -> Any:
+        if dataclasses.is_dataclass(obj):
+            return dataclasses.asdict(obj)
+        return str(obj)
+
+    blob = json.dumps([_renderer_fingerprint, *inputs], default=default, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _digest_view(username: str, table: RepoTable) -> dict[str, list[Any]]:
+    # The workflow's own commit bumps the profile repo's pushedAt and commit
+    # count on every run; leaving them out keeps quiet days at zero changes.
+    pushed_at: list[str | None] = [None] * len(table)
+    commits = [0] * len(table)
+    for i in table.without_owner_repo(username):
+        pushed_at[i] = table.pushed_at[i]
+        commits[i] = table.commits[i]
+    return {
+        "names": table.names,
+        "urls": table.urls,
+        "stars": table.stars.tolist(),
+        "languages": table.languages,
+        "pushed_at": pushed_at,
+        "commits": commits,
+    }
+
+
+def _render_if_changed(
+    manifest: OutputManifest,
+    key: str,
+    digest: str,
+    output: Path | Sequence[Path] | None,
+    render: Callable[[], None],
+) -> bool:
+    if manifest.is_current(key, digest, output):
+        print(f"  → {key} unchanged, skipped")
+        return False
+    render()
+    manifest.record(key, digest)
+    return True
+
+
+@dataclass(frozen=True)
+class GenerationOptions:
+    update_readme: bool = True
+    # When set, repositories are fetched incrementally against <snapshot_dir>/<login>.json
+    snapshot_dir: Path | None = None
+    # When set, the overview is split into pages of this many rows plus an index
+    overview_page_size: int | None = None
+    # Render generated/cards/<repo>.svg for every repository
+    cards: bool = False
+    card_workers: int | None = None
+    # Process pool (see _card_pool) shared by every login of a batch run;
+    # without it each login starts its own pool of card_workers processes
+    card_pool: Any = None
+    # When set, also fetch commit contributions over this many days (may exceed
+    # a year) and render repo-commits.svg
+    commit_days: int | None = None
+    period_label: str = "últimos 12 meses"
+    # When set, weekly activity is accumulated in <activity_dir>/<login>/ and
+    # drawn as sparklines covering the last sparkline_weeks weeks
+    activity_dir: Path | None = None
+    sparkline_weeks: int = 26
+    # Write compact SVG markup plus a gzip-precompressed .svgz of every chart
+    optimize_svg: bool = False
+    # When set, list repositories through this many concurrent search slices
+    # instead of one serial cursor chain
+    search_partitions: int | None = None
+    # When set, total_commits comes from bare mirrors kept in this directory
+    # (see GitMirrorCounter) instead of GraphQL history counts
+    git_mirror_dir: Path | None = None
+    git_workers: int = 8
+    # Extra theme × locale renderings of every chart, written next to the
+    # default ones from the same layout (see Variant)
+    variants: tuple[Variant, ...] = ()
+    # When set, an all-time daily contribution calendar is kept in
+    # <calendar_dir>/<login>/ and drawn as contributions-heatmap.svg
+    calendar_dir: Path | None = None
+    heatmap_years: int | None = None
+
+
+@dataclass(frozen=True)
+class ProfileData:
+    """Everything the renderers need for one login, as written by `fetch`"""
+
+    username: str
+    repos: RepoTable
+    stats: list[RepoCommitStat] | None = None
+    fetched_at: str | None = None
+
+
+def save_profile_data(path: Path, data: ProfileData) -> None:
+    payload = {
+        "username": data.username,
+        "fetched_at": data.fetched_at,
+        "repos": [dataclasses.asdict(r) for r in data.repos],
+        "stats": None if data.stats is None else [dataclasses.asdict(s) for s in data.stats],
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_profile_data(path: Path) -> ProfileData:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise RuntimeError(f"No profile data at {path}; run the fetch command first") from exc
+    stats = payload.get("stats")
+    return ProfileData(
+        username=payload["username"],
+        repos=RepoTable.from_repos(RepoInfo(**r) for r in payload["repos"]),
+        stats=None if stats is None else [RepoCommitStat(**s) for s in stats],
+        fetched_at=payload.get("fetched_at"),
+    )
+
+
+def fetch_profile_data(
+    transport: GraphQLTransport,
+    username: str,
+    options: GenerationOptions = GenerationOptions(),
+) -> ProfileData:
+    """Fetch everything the renderers need for a single login"""
+    metrics = transport.metrics
+
+    print(f"\n📂 [{username}] Fetching all repositories with commit history...")
+    stats: list[RepoCommitStat] | None = None
+    with metrics.phase("fetch"):
+        if options.git_mirror_dir is not None:
+            counter = GitMirrorCounter(options.git_mirror_dir, workers=options.git_workers)
+            repos = fetch_repositories_with_git(transport, username, counter)
+            if options.commit_days:
+                stats = fetch_commit_contributions_by_repo(transport, username, days=options.commit_days)
+        elif options.snapshot_dir is not None:
+            repos = fetch_repositories_incremental(
+                transport,
+                username=username,
+                snapshot_path=options.snapshot_dir / f"{username.lower()}.json",
+            )
+            if options.commit_days:
+                stats = fetch_commit_contributions_by_repo(transport, username, days=options.commit_days)
+        elif options.search_partitions:
+            repos = fetch_repositories_partitioned(transport, username, partitions=options.search_partitions)
+            if options.commit_days:
+                stats = fetch_commit_contributions_by_repo(transport, username, days=options.commit_days)
+        elif options.commit_days:
+            stats, repos = fetch_profile_bundle(transport, username, days=options.commit_days)
+        else:
+            repos = fetch_all_repositories(transport, username=username)
+    print(f"✓ [{username}] Found {len(repos)} public repositories")
+
+    total_commits = sum(r.total_commits for r in repos)
+    print(f"✓ [{username}] Total commits across all repos: {total_commits}")
+
+    if options.activity_dir is not None:
+        ActivityStore(options.activity_dir / username.lower()).record(repos)
+
+    if options.calendar_dir is not None:
+        with metrics.phase("fetch_calendar"):
+            days = ContributionCalendar(options.calendar_dir / username.lower()).update(transport, username)
+        print(f"✓ [{username}] Contribution calendar updated ({days} days fetched)")
+
+    # Only the columns are kept; the RepoInfo list is dropped on return
+    return ProfileData(username, RepoTable.from_repos(repos), stats, dt.datetime.now(dt.timezone.utc).isoformat())
+
+
+@dataclass
+class _StreamedOutputs:
+    """Outputs fed page by page while the fetch was still running"""
+
+    manifest: OutputManifest
+    table: RepoTable
+    markdown: _MarkdownStream
+    cards: _CardStream | None = None
+
+
+def render_profile_assets(
+    data: ProfileData,
+    out_dir: Path,
+    options: GenerationOptions = GenerationOptions(),
+    metrics: RunMetrics | None = None,
+    streamed: _StreamedOutputs | None = None,
+) -> None:
+    """Render every asset for a single login into out_dir; no network access
+
+    With `streamed` (see pipelined_profile_assets), the table, markdown and
+    cards built during the fetch are finished instead of rendered again.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    metrics = metrics or RunMetrics()
+    username, table, stats = data.username, data.repos, data.stats
+
+    activity: ActivitySeries | None = None
+    if options.activity_dir is not None:
+        store = ActivityStore(options.activity_dir / username.lower())
+        activity = store.series(table.names, weeks=options.sparkline_weeks)
+    activity_digest = activity.digest if activity is not None else None
+
+    manifest = streamed.manifest if streamed else OutputManifest(out_dir / ".manifest.json")
+    view = _digest_view(username, table)
+    variants = options.variants
+    variant_names = [v.suffix for v in variants]
+
+    print(f"\n🎨 [{username}] Generating combined repos SVG...")
+    with metrics.phase("render_overview"):
+        if options.overview_page_size:
+            index_path = out_dir / "repos-overview-index.md"
+            page_count = max(1, math.ceil(len(table.without_owner_repo(username)) / options.overview_page_size))
+            if _render_if_changed(
+                manifest,
+                index_path.name,
+                _input_digest(username, view, options.overview_page_size, activity_digest, options.optimize_svg, variant_names),
+                [index_path, *_page_paths(out_dir, "repos-overview", page_count, variants, options.optimize_svg)],
+                lambda: render_paged_repos_svg(
+                    username,
+                    table,
+                    out_dir,
+                    page_size=options.overview_page_size,
+                    activity=activity,
+                    optimize=options.optimize_svg,
+                    variants=variants,
+                ),
+            ):
+                print(f"✓ Created: {index_path}")
+        else:
+            overview_path = out_dir / "repos-overview.svg"
+            if _render_if_changed(
+                manifest,
+                overview_path.name,
+                _input_digest(username, view, activity_digest, options.optimize_svg, variant_names),
+                _variant_paths(overview_path, variants, options.optimize_svg),
+                lambda: render_combined_repos_svg(
+                    username=username,
+                    repos=table,
+                    out_path=overview_path,
+                    activity=activity,
+                    optimize=options.optimize_svg,
+                    variants=variants,
+                ),
+            ):
+                print(f"✓ Created: {overview_path}")
+
+    if stats is not None:
+        print(f"\n📊 [{username}] Generating commits SVG...")
+        commits_path = out_dir / "repo-commits.svg"
+        with metrics.phase("render_commits"):
+            if _render_if_changed(
+                manifest,
+                commits_path.name,
+                _input_digest(username, options.period_label, stats, options.optimize_svg, variant_names),
+                _variant_paths(commits_path, variants, options.optimize_svg),
+                lambda: render_commits_svg(
+                    username,
+                    options.period_label,
+                    stats,
+                    commits_path,
+                    optimize=options.optimize_svg,
+                    variants=variants,
+                    period_days=options.commit_days,
+                ),
+            ):
+                print(f"✓ Created: {commits_path}")
+
+    if options.calendar_dir is not None:
+        calendar = ContributionCalendar(options.calendar_dir / username.lower())
+        heatmap_path = out_dir / "contributions-heatmap.svg"
+        print(f"\n🗓  [{username}] Generating contributions heatmap...")
+        with metrics.phase("render_heatmap"):
+            if _render_if_changed(
+                manifest,
+                heatmap_path.name,
+                _input_digest(username, calendar.digest(), options.heatmap_years, options.optimize_svg, variant_names),
+                _variant_paths(heatmap_path, variants, options.optimize_svg),
+                lambda: render_contribution_heatmap_svg(
+                    username,
+                    calendar,
+                    heatmap_path,
+                    years=options.heatmap_years,
+                    optimize=options.optimize_svg,
+                    variants=variants,
+                ),
+            ):
+                print(f"✓ Created: {heatmap_path}")
+
+    if streamed and streamed.cards:
+        print(f"\n🃏 [{username}] Finishing repository cards...")
+        with metrics.phase("render_cards"):
+            streamed.cards.finish()
+    elif options.cards:
+        print(f"\n🃏 [{username}] Generating repository cards...")
+        with metrics.phase("render_cards"):
+            render_repo_cards(
+                table,
+                out_dir / "cards",
+                manifest,
+                workers=options.card_workers,
+                optimize=options.optimize_svg,
+                variants=variants,
+                pool=options.card_pool,
+            )
+
+    print(f"\n📝 [{username}] Generating repositories.md...")
+    markdown_path = out_dir / "repositories.md"
+    with metrics.phase("render_markdown"):
+        if streamed:
+            if streamed.markdown.finish(manifest, markdown_path.name, _input_digest(username, view)):
+                print(f"✓ Created: {markdown_path}")
+        elif _render_if_changed(
+            manifest,
+            markdown_path.name,
+            _input_digest(username, view),
+            markdown_path,
+            lambda: render_repos_markdown(username=username, repos=table, out_path=markdown_path),
+        ):
+            print(f"✓ Created: {markdown_path}")
+
+    if options.update_readme:
+        print("\n📄 Updating README.md sections...")
+        with metrics.phase("update_readme"):
+            if _render_if_changed(
+                manifest,
+                "README",
+                _input_digest(username, view, stats, activity_digest, sorted(README_SECTIONS)),
+                None,
+                lambda: update_readme_sections(ReadmeContext(username, table, stats, activity)),
+            ):
+                print("✓ README updated successfully")
+
+    manifest.save()
+
+
+def generate_profile_assets(
+    transport: GraphQLTransport,
+    username: str,
+    out_dir: Path,
+    options: GenerationOptions = GenerationOptions(),
+    data_path: Path | None = None,
+) -> RepoTable:
+    """Fetch and render every asset for a single login into out_dir.
+
+    With `data_path`, the fetched data is also saved there for later
+    render-only runs.
+    """
+    data = fetch_profile_data(transport, username, options)
+    if data_path is not None:
+        save_profile_data(data_path, data)
+    render_profile_assets(data, out_dir, options, transport.metrics)
+    return data.repos
+
+
+def pipelined_profile_assets(
+    transport: GraphQLTransport,
+    username: str,
+    out_dir: Path,
+    options: GenerationOptions = GenerationOptions(),
+    data_path: Path | None = None,
+    queue_size: int = 4,
+) -> RepoTable:
+    """generate_profile_assets with fetching and rendering overlapped.
+
+    A producer thread walks the repository pages into a bounded queue (it
+    blocks once `queue_size` pages are waiting, so a slow consumer holds the
+    fetch back instead of buffering the whole account). Meanwhile this
+    thread appends each page to the table, writes its markdown rows and
+    hands its cards to the process pool. The overview is ordered by commits
+    and needs every page, so it and the README are written after the last
+    one, from the table that is already built.
+    """
+    if options.snapshot_dir is not None or options.search_partitions or options.git_mirror_dir is not None:
+        # The incremental and git fetches work from a full listing and search
+        # slices complete out of order; none of them has pages to stream
+        return generate_profile_assets(transport, username, out_dir, options, data_path)
+
+    import queue
+
+    metrics = transport.metrics
+    pages: queue.Queue[list[RepoInfo] | BaseException | None] = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    stats: list[RepoCommitStat] | None = None
+
+    def put(item: list[RepoInfo] | BaseException | None) -> bool:
+        # Re-check `stop` while blocked on a full queue, so a consumer that
+        # gave up never leaves this thread waiting forever
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        nonlocal stats
+        try:
+            with metrics.phase("fetch"):
+                for page in iter_repository_pages(transport, username):
+                    if not put(page):
+                        return
+                if options.commit_days:
+                    stats = fetch_commit_contributions_by_repo(transport, username, days=options.commit_days)
+                if options.calendar_dir is not None:
+                    ContributionCalendar(options.calendar_dir / username.lower()).update(transport, username)
+        except BaseException as exc:
+            put(exc)
+        else:
+            put(None)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = OutputManifest(out_dir / ".manifest.json")
+    streamed = _StreamedOutputs(
+        manifest=manifest,
+        table=RepoTable(),
+        markdown=_MarkdownStream(username, out_dir / "repositories.md"),
+        cards=(
+            _CardStream(
+                out_dir / "cards",
+                manifest,
+                options.card_workers,
+                options.optimize_svg,
+                options.variants,
+                options.card_pool,
+            )
+            if options.cards
+            else None
+        ),
+    )
+    table = streamed.table
+
+    print(f"\n📂 [{username}] Fetching repositories and rendering as pages arrive...")
+    producer = threading.Thread(target=produce, name=f"fetch-{username}", daemon=True)
+    producer.start()
+    try:
+        with metrics.phase("render_stream"):
+            while (item := pages.get()) is not None:
+                if isinstance(item, BaseException):
+                    raise item
+                table.extend(item)
+                streamed.markdown.add(item)
+                if streamed.cards is not None:
+                    streamed.cards.add(item)
+    except BaseException:
+        stop.set()
+        while True:
+            try:
+                pages.get_nowait()
+            except queue.Empty:
+                break
+        producer.join()
+        streamed.markdown.discard()
+        if streamed.cards is not None:
+            streamed.cards.cancel()
+        raise
+    producer.join()
+    print(f"✓ [{username}] Found {len(table)} public repositories")
+
+    if options.activity_dir is not None:
+        ActivityStore(options.activity_dir / username.lower()).record(table)
+
+    data = ProfileData(username, table, stats, dt.datetime.now(dt.timezone.utc).isoformat())
+    if data_path is not None:
+        save_profile_data(data_path, data)
+    render_profile_assets(data, out_dir, options, metrics, streamed)
+    return table
+
+
+def _read_logins(args: argparse.Namespace) -> list[str]:
+    logins: list[str] = list(args.logins)
+    if args.logins_file:
+        for line in Path(args.logins_file).read_text(encoding="utf-8").splitlines():
+            line = line.split("#", 1)[0].strip()
+            if line:
+                logins.append(line)
+
+    # Keep the first occurrence of each login, GitHub logins are case-insensitive
+    seen: set[str] = set()
+    unique: list[str] = []
+    for login in logins:
+        if login.lower() not in seen:
+            seen.add(login.lower())
+            unique.append(login)
+    return unique
+
+
+def _stale_first(logins: list[str], data_path: Callable[[str], Path]) -> list[str]:
+    """Logins ordered by the age of their data file, never-fetched ones first"""
+
+    def fetched(login: str) -> float:
+        try:
+            return data_path(login).stat().st_mtime
+        except OSError:
+            return -math.inf
+
+    return sorted(logins, key=fetched)
+
+
+def _run_logins(
+    logins: list[str],
+    concurrency: int,
+    job: Callable[[str], Any],
+    budget: RateLimitBudget | None = None,
+) -> dict[str, Exception]:
+    """Run job(login) for every login on a thread pool, in list order.
+
+    With a budget, each job also holds one of budget.slot()'s permits, so
+    fewer logins run at once as the rate-limit window drains.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    failures: dict[str, Exception] = {}
+    workers = max(1, min(concurrency, len(logins)))
+    print(f"✓ Batch: {len(logins)} logins, {workers} workers")
+
+    def run(login: str) -> Any:
+        if budget is None:
+            return job(login)
+        with budget.slot():
+            return job(login)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile") as pool:
+        futures = {pool.submit(run, login): login for login in logins}
+        for future in as_completed(futures):
+            login = futures[future]
+            try:
+                future.result()
+                print(f"✓ [{login}] done")
+            except Exception as exc:
+                failures[login] = exc
+                print(f"❌ [{login}] failed: {exc}")
+
+    return failures
 
-    before = content[: start_idx]
-    after = content[end_idx + len(end_marker) :]
-    updated = before + "\n" + "\n".join(lines) + "\n" + after.lstrip("\n")
-    readme_path.write_text(updated, encoding="utf-8")
 
+COMMANDS = ("fetch", "render", "all", "top")
 
-def main() -> None:
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] not in (*COMMANDS, "-h", "--help"):
+        # Invocations from before the subcommands existed mean `all`
+        argv.insert(0, "all")
+
+    # Every command: which logins to run and how to report on the run
+    batch = argparse.ArgumentParser(add_help=False)
+    batch.add_argument(
+        "logins",
+        nargs="*",
+        help="Logins (users or orgs) to generate in batch mode. Defaults to GITHUB_USERNAME.",
+    )
+    batch.add_argument("--logins-file", help="File with one login per line (# starts a comment).")
+    batch.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("BATCH_CONCURRENCY", "8")),
+        help="Maximum number of logins processed at the same time in batch mode.",
+    )
+    batch.add_argument("--metrics", type=Path, help="Write per-phase and GraphQL metrics for this run as JSON.")
+    batch.add_argument("--prometheus", type=Path, help="Also write the metrics in Prometheus text format.")
+
+    # The commands that fetch or render a profile data file
+    common = argparse.ArgumentParser(add_help=False, parents=[batch])
+    common.add_argument(
+        "--data-dir",
+        type=Path,
+        default=CACHE_DIR / "data",
+        help="Where fetch writes, and render reads, <login>.json.",
+    )
+    common.add_argument(
+        "--sparklines",
+        action="store_true",
+        help="Record weekly commit activity and draw per-repo sparklines in the overview.",
+    )
+    common.add_argument("--activity-dir", type=Path, default=CACHE_DIR / "activity")
+    common.add_argument(
+        "--calendar",
+        action="store_true",
+        help="Keep an all-time daily contribution calendar (fetching only new days) and draw contributions-heatmap.svg.",
+    )
+    common.add_argument("--calendar-dir", type=Path, default=CACHE_DIR / "calendar")
+
+    # How GraphQL is reached: response cache, rate-limit budget, record/replay
+    transport = argparse.ArgumentParser(add_help=False)
+    cache = transport.add_argument_group("GraphQL response cache")
+    cache.add_argument("--no-cache", action="store_true", help="Neither read nor write the response cache.")
+    cache.add_argument("--refresh", action="store_true", help="Ignore cached responses but store the new ones.")
+    cache.add_argument("--cache-dir", type=Path, default=CACHE_DIR / "graphql")
+    cache.add_argument(
+        "--cache-ttl",
+        action="append",
+        metavar="[OPERATION=]SECONDS",
+        help=(
+            "Seconds a cached response stays fresh (default: $GRAPHQL_CACHE_TTL or 3600). "
+            "OPERATION=SECONDS overrides one query, e.g. ContributionCalendar=60; repeatable. "
+            f"Built-in overrides: {', '.join(f'{op}={ttl:g}' for op, ttl in CACHE_TTLS.items())}."
+        ),
+    )
+    cache.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=float(os.getenv("GRAPHQL_CACHE_MAX_MB", "64")),
+        help="On-disk size limit; least recently used entries are evicted first.",
+    )
+    budget = transport.add_argument_group("rate-limit budget")
+    budget.add_argument(
+        "--rate-reserve",
+        type=int,
+        default=int(os.getenv("GRAPHQL_RATE_RESERVE", "100")),
+        help="GraphQL points per window left untouched; requests that would dip below pause until resetAt.",
+    )
+    budget.add_argument(
+        "--rate-budget",
+        type=int,
+        metavar="POINTS",
+        help="Most points this run may spend per rate-limit window (pauses until resetAt beyond that).",
+    )
+    cassettes = transport.add_argument_group("record/replay").add_mutually_exclusive_group()
+    cassettes.add_argument("--record", type=Path, metavar="CASSETTE", help="Save every GraphQL exchange to this file.")
+    cassettes.add_argument("--replay", type=Path, metavar="CASSETTE", help="Answer GraphQL queries from this file offline.")
+
+    fetching = argparse.ArgumentParser(add_help=False, parents=[transport])
+    fetching.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the last run's snapshot and only fetch commit history for repos pushed since then.",
+    )
+    fetching.add_argument("--snapshot-dir", type=Path, default=CACHE_DIR / "snapshots")
+    fetching.add_argument(
+        "--git-mirrors",
+        type=Path,
+        metavar="DIR",
+        help="Count commits with git rev-list in bare mirrors kept under DIR instead of via the API.",
+    )
+    fetching.add_argument("--git-workers", type=int, default=8, help="Parallel git clones/fetches for --git-mirrors.")
+    fetching.add_argument(
+        "--partitions",
+        type=int,
+        metavar="N",
+        help="List repositories via the search API in N created: date slices fetched concurrently (large orgs).",
+    )
+    fetching.add_argument(
+        "--commits-chart",
+        action="store_true",
+        help="Also fetch commit contributions over PERIOD_DAYS (any length) for repo-commits.svg.",
+    )
+
+    rendering = argparse.ArgumentParser(add_help=False)
+    rendering.add_argument(
+        "--out-root",
+        type=Path,
+        default=OUT_DIR,
+        help="Batch mode writes each login to <out-root>/<login>/.",
+    )
+    rendering.add_argument(
+        "--overview-page-size",
+        type=int,
+        help="Split the overview into fixed-height SVG pages of this many repos plus an index.",
+    )
+    rendering.add_argument("--sparkline-weeks", type=int, default=26)
+    rendering.add_argument("--heatmap-years", type=int, help="Draw only the newest N years of the heatmap.")
+    rendering.add_argument("--cards", action="store_true", help="Also render one SVG card per repository.")
+    rendering.add_argument("--card-workers", type=int, help="Processes used for card rendering (default: CPU count).")
+    rendering.add_argument(
+        "--optimize-svg",
+        action="store_true",
+        help="Write compact SVG markup and a gzip-precompressed .svgz next to every chart.",
+    )
+    rendering.add_argument(
+        "--themes",
+        help=f"Comma-separated themes ({', '.join(THEMES)}) to render as extra <name>-<theme>-<locale>.svg variants.",
+    )
+    rendering.add_argument(
+        "--locales",
+        help=f"Comma-separated locales ({', '.join(LOCALES)}) for the variants; each theme × locale is written once.",
+    )
+
+    parser = argparse.ArgumentParser(description="Generate GitHub profile SVG/Markdown assets.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser(
+        "fetch",
+        parents=[common, fetching],
+        help="Fetch from GitHub into <data-dir>/<login>.json; renders nothing.",
+    )
+    commands.add_parser(
+        "render",
+        parents=[common, rendering],
+        help="Render from <data-dir>/<login>.json without any network access.",
+    )
+    everything = commands.add_parser(
+        "all",
+        parents=[common, fetching, rendering],
+        help="Fetch, save the data file and render (the default).",
+    )
+    everything.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Render each repository page while the next one is fetched instead of after the whole fetch.",
+    )
+    everything.add_argument("--pipeline-depth", type=int, default=4, help="Pages buffered between fetch and render.")
+    top = commands.add_parser(
+        "top",
+        # Only the transport options: top always streams iter_repositories and
+        # has no data file, snapshots, mirrors, sparklines or calendar
+        parents=[batch, transport],
+        help="Stream all repositories into repo-top-commits.svg in bounded memory (very large orgs).",
+    )
+    top.add_argument("--rows", type=int, default=15, help="Repositories drawn in the chart.")
+    top.add_argument("--out-root", type=Path, default=OUT_DIR, help="Batch mode writes each login to <out-root>/<login>/.")
+    top.add_argument("--optimize-svg", action="store_true", help="Write compact SVG markup and a gzip-precompressed .svgz.")
+    top.add_argument("--locale", choices=sorted(LOCALES), default=DEFAULT_LOCALE.code, help="Language of the chart's labels.")
+    args = parser.parse_args(argv)
+
+    args.variants = ()
+    if getattr(args, "themes", None) or getattr(args, "locales", None):
+        themes = (args.themes or DEFAULT_THEME.name).split(",")
+        locales = (args.locales or DEFAULT_LOCALE.code).split(",")
+        try:
+            variants = (Variant.parse(f"{t.strip()}-{l.strip()}") for t in themes for l in locales)
+            # The default file already is dark-pt; a -dark-pt copy would duplicate it byte for byte
+            args.variants = tuple(v for v in variants if v != Variant(DEFAULT_THEME, DEFAULT_LOCALE))
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if hasattr(args, "cache_ttl"):
+        try:
+            args.cache_ttl, args.cache_ttls = _parse_cache_ttls(args.cache_ttl or [])
+        except ValueError as exc:
+            parser.error(str(exc))
+    return args
+
+
+def _parse_cache_ttls(values: Sequence[str]) -> tuple[float, dict[str, float]]:
+    """Split --cache-ttl values into the default TTL and per-operation overrides"""
+    default = float(os.getenv("GRAPHQL_CACHE_TTL", "3600"))
+    ttls = dict(CACHE_TTLS)
+    for value in values:
+        operation, _, seconds = value.rpartition("=")
+        try:
+            ttl = float(seconds)
+        except ValueError:
+            raise ValueError(f"invalid --cache-ttl {value!r}: expected SECONDS or OPERATION=SECONDS") from None
+        if operation:
+            ttls[operation] = ttl
+        else:
+            default = ttl
+    return default, ttls
+
+
+def _build_transport(
+    args: argparse.Namespace,
+    token: str,
+    pool_size: int = 16,
+    budget: RateLimitBudget | None = None,
+) -> GraphQLTransport:
+    cache = None
+    if not args.no_cache:
+        cache = GraphQLResponseCache(
+            args.cache_dir,
+            default_ttl=args.cache_ttl,
+            ttls=args.cache_ttls,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
+    if args.replay:
+        return ReplayTransport(args.replay)
+    if args.record:
+        return RecordingTransport(
+            token, args.record, pool_size=pool_size, cache=cache, budget=budget
+        )
+    return GraphQLTransport(token, pool_size=pool_size, cache=cache, refresh=args.refresh, budget=budget)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
     print("🚀 Starting profile asset generation...")
-    
-    token = _require_env("GITHUB_TOKEN")
-    username = os.getenv("GITHUB_USERNAME") or os.getenv("GITHUB_REPOSITORY_OWNER")
-    if not username:
-        raise RuntimeError("Missing GITHUB_USERNAME or GITHUB_REPOSITORY_OWNER")
-    
-    print(f"✓ Username: {username}")
+
+    fetching = args.command in ("fetch", "all", "top")
+    rendering = args.command in ("render", "all")
+    token = "replay" if not fetching or args.replay else _require_env("GITHUB_TOKEN")
 
     days = int(os.getenv("PERIOD_DAYS", "365"))
     period_label = os.getenv("PERIOD_LABEL") or "últimos 12 meses"
-    print(f"✓ Period: {days} days ({period_label})")
 
-    OUT_DIR.mkdir(parents=True, exist_ok=True)
-    
-    print("\n📂 Fetching all repositories with commit history...")
-    repos = fetch_all_repositories(token, username=username)
-    print(f"✓ Found {len(repos)} public repositories")
-    
-    total_commits = sum(r.total_commits for r in repos)
-    print(f"✓ Total commits across all repos: {total_commits}")
-    
-    print("\n🎨 Generating combined repos SVG...")
-    render_combined_repos_svg(
-        username=username,
-        repos=repos,
-        out_path=OUT_DIR / "repos-overview.svg",
+    # `top` only needs the transport; it has none of the data-file options
+    options = GenerationOptions()
+    if args.command != "top":
+        options = GenerationOptions(
+            snapshot_dir=args.snapshot_dir if fetching and args.incremental else None,
+            overview_page_size=args.overview_page_size if rendering else None,
+            cards=rendering and args.cards,
+            card_workers=args.card_workers if rendering else None,
+            # `render` never fetches; there the days only name the period in other locales
+            commit_days=days if (fetching and args.commits_chart) or args.command == "render" else None,
+            search_partitions=args.partitions if fetching else None,
+            git_mirror_dir=args.git_mirrors if fetching else None,
+            git_workers=args.git_workers if fetching else 8,
+            period_label=period_label,
+            activity_dir=args.activity_dir if args.sparklines else None,
+            sparkline_weeks=args.sparkline_weeks if rendering else 26,
+            optimize_svg=rendering and args.optimize_svg,
+            variants=args.variants,
+            calendar_dir=args.calendar_dir if args.calendar else None,
+            heatmap_years=args.heatmap_years if rendering else None,
+        )
+
+    logins = _read_logins(args)
+    if not logins:
+        username = os.getenv("GITHUB_USERNAME") or os.getenv("GITHUB_REPOSITORY_OWNER")
+        if not username:
+            raise RuntimeError("Missing GITHUB_USERNAME or GITHUB_REPOSITORY_OWNER")
+
+        print(f"✓ Username: {username}")
+        print(f"✓ Period: {days} days ({period_label})")
+
+    def data_path(login: str) -> Path:
+        return args.data_dir / f"{login.lower()}.json"
+
+    def out_dir(login: str) -> Path:
+        return args.out_root / login if logins else OUT_DIR
+
+    card_pool = None
+    if logins:
+        options = dataclasses.replace(options, update_readme=False)
+        card_workers = options.card_workers or os.cpu_count() or 1
+        if options.cards and card_workers > 1:
+            # One pool for the whole batch, not card_workers processes per concurrent login
+            card_pool = _card_pool(card_workers)
+            options = dataclasses.replace(options, card_pool=card_pool)
+
+    failures: dict[str, Exception] = {}
+    budget = None
+    if fetching and not args.replay:
+        budget = RateLimitBudget(args.rate_reserve, args.rate_budget, max_concurrency=args.concurrency)
+        if logins and args.command != "top":
+            logins = _stale_first(logins, data_path)
+    transport = (
+        _build_transport(args, token, pool_size=args.concurrency if logins else 16, budget=budget) if fetching else None
     )
-    print(f"✓ Created: {OUT_DIR / 'repos-overview.svg'}")
-    
+    metrics = transport.metrics if transport is not None else RunMetrics()
+    try:
+        if args.command == "render":
+            def job(login: str) -> None:
+                render_profile_assets(load_profile_data(data_path(login)), out_dir(login), options, metrics)
+        elif args.command == "top":
+            def job(login: str) -> None:
+                aggregate = render_top_repos_svg(
+                    transport,
+                    login,
+                    out_dir(login) / "repo-top-commits.svg",
+                    args.rows,
+                    args.optimize_svg,
+                    LOCALES[args.locale],
+                )
+                print(f"✓ [{login}] {aggregate.count} repositories, {aggregate.total_commits} commits, {aggregate.total_stars} stars")
+        elif args.command == "fetch":
+            def job(login: str) -> None:
+                save_profile_data(data_path(login), fetch_profile_data(transport, login, options))
+                print(f"✓ [{login}] Data written to {data_path(login)}")
+        elif args.pipeline:
+            def job(login: str) -> None:
+                pipelined_profile_assets(
+                    transport, login, out_dir(login), options, data_path(login), queue_size=args.pipeline_depth
+                )
+        else:
+            def job(login: str) -> None:
+                generate_profile_assets(transport, login, out_dir(login), options, data_path(login))
 
-    print("\n�📝 Generating repositories.md...")
-    render_repos_markdown(username=username, repos=repos, out_path=OUT_DIR / "repositories.md")
-    print(f"✓ Created: {OUT_DIR / 'repositories.md'}")
-    
-    print("\n📄 Updating README.md with repo list...")
-    update_readme_repo_section(username=username, repos=repos)
-    print("✓ README updated successfully")
-    
+        with transport if transport is not None else nullcontext():
+            if logins:
+                failures = _run_logins(logins, args.concurrency, job, budget)
+            else:
+                job(username)
+    finally:
+        if card_pool is not None:
+            card_pool.shutdown(cancel_futures=True)
+        if args.metrics:
+            metrics.write_json(args.metrics)
+            print(f"✓ Metrics written to {args.metrics}")
+        if args.prometheus:
+            metrics.write_prometheus(args.prometheus)
+            print(f"✓ Prometheus metrics written to {args.prometheus}")
+
+    if failures:
+        print(f"\n❌ {len(failures)} of {len(logins)} logins failed: {', '.join(sorted(failures))}")
+        sys.exit(1)
     print("\n✅ All assets generated successfully!")
 
 
@@ -0,0 +1,280 @@
+"""Serve profile SVGs on demand instead of committing them from a cron job.
+
+    GITHUB_TOKEN=... python scripts/profile_server.py --port 8080
+    curl http://127.0.0.1:8080/octocat/overview.svg
+
+Routes (logins are case-insensitive):
+
+    /<login>/overview.svg        render_combined_repos_svg
+    /<login>/commits.svg         render_commits_svg
+    /<login>/cards/<repo>.svg    render_repo_card_svg
+
+Each login's data is fetched once and kept in an in-memory LRU. Within
+--ttl it is served as is; for --stale-ttl more it is still served while a
+background refresh runs; after that the next request waits for a fresh
+fetch. Concurrent misses for the same login share one fetch. Responses
+carry an ETag and answer If-None-Match with 304.
+
+Point GITHUB_GRAPHQL_URL at scripts/cassette_server.py (or use --replay) to
+run it without touching api.github.com.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+import generate_profile_assets as gpa
+
+_ROUTE_RE = re.compile(r"^/(?P<login>[A-Za-z0-9][A-Za-z0-9-]{0,38})/(?P<asset>overview|commits|cards/[A-Za-z0-9._-]+)\.svg$")
+
+
+@dataclass
+class _Entry:
+    data: gpa.ProfileData
+    fetched_at: float
+    # asset name -> (body, etag), rendered on first request
+    assets: dict[str, tuple[bytes, str]] = field(default_factory=dict)
+
+
+def _render_to_bytes(render: Callable[[Path], None]) -> bytes:
+    # The renderers write files; give each one a scratch path and read it back
+    with tempfile.TemporaryDirectory(prefix="profile-svg-") as tmp:
+        path = Path(tmp) / "asset.svg"
+        render(path)
+        return path.read_bytes()
+
+
+class ProfileService:
+    """LRU of fetched profiles with stale-while-revalidate and per-login request coalescing"""
+
+    def __init__(
+        self,
+        transport: gpa.GraphQLTransport,
+        ttl: float = 600,
+        stale_ttl: float = 86400,
+        max_logins: int = 256,
+        commit_days: int = 365,
+        period_label: str = "últimos 12 meses",
+        refresh_workers: int = 4,
+    ) -> None:
+        self.transport = transport
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_logins = max_logins
+        self.period_label = period_label
+        self.options = gpa.GenerationOptions(update_readme=False, commit_days=commit_days, period_label=period_label)
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._inflight: dict[str, Future[_Entry]] = {}
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix="refresh")
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def close(self) -> None:
+        self._refresher.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, login: str, asset: str) -> tuple[bytes, str]:
+        """Body and ETag of `asset` for `login`; KeyError for an unknown card"""
+        key = login.lower()
+        with self._lock:
+            entry = self._entries.get(key)
+            age = None if entry is None else time.monotonic() - entry.fetched_at
+            if age is None or age > self.ttl + self.stale_ttl:
+                self.misses += 1
+                entry = None
+            else:
+                self._entries.move_to_end(key)
+                if age > self.ttl:
+                    self.stale_hits += 1
+                else:
+                    self.hits += 1
+
+        if entry is None:
+            entry = self._load(login)
+        elif age > self.ttl and key not in self._inflight:
+            self._refresher.submit(self._refresh, login)
+        return self._asset(entry, asset)
+
+    def _refresh(self, login: str) -> None:
+        try:
+            self._load(login)
+        except Exception as exc:
+            print(f"⚠ [{login}] background refresh failed: {exc}")
+
+    def _load(self, login: str) -> _Entry:
+        key = login.lower()
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = Future()
+        if not leader:
+            return flight.result()
+
+        try:
+            with self._lock:
+                self.fetches += 1
+            data = gpa.fetch_profile_data(self.transport, login, self.options)
+            entry = _Entry(data, time.monotonic())
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_logins:
+                    self._entries.popitem(last=False)
+            flight.set_result(entry)
+            return entry
+        except BaseException as exc:
+            flight.set_exception(exc)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def _asset(self, entry: _Entry, asset: str) -> tuple[bytes, str]:
+        cached = entry.assets.get(asset)
+        if cached is not None:
+            return cached
+
+        data = entry.data
+        if asset == "overview":
+            body = _render_to_bytes(lambda path: gpa.render_combined_repos_svg(data.username, data.repos, path))
+        elif asset == "commits":
+            stats = data.stats or []
+            body = _render_to_bytes(lambda path: gpa.render_commits_svg(data.username, self.period_label, stats, path))
+        else:
+            name = asset.removeprefix("cards/").lower()
+            table = data.repos
+            row = next((i for i, n in enumerate(table.names) if n.split("/")[-1].lower() == name), None)
+            if row is None:
+                raise KeyError(asset)
+            repo = table.row(row)
+            body = _render_to_bytes(lambda path: gpa.render_repo_card_svg(repo, path, 0))
+
+        # Concurrent first requests may both render; either result is the same
+        cached = entry.assets[asset] = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+        return cached
+
+
+class ProfileServer:
+    def __init__(self, service: ProfileService, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.service = service
+        server = self
+        cache_control = f"public, max-age={int(service.ttl)}, stale-while-revalidate={int(service.stale_ttl)}"
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+            def do_GET(self) -> None:
+                match = _ROUTE_RE.match(urllib.parse.urlsplit(self.path).path)
+                if match is None:
+                    self._reply(404, b"Not found\n", "text/plain; charset=utf-8")
+                    return
+                try:
+                    body, etag = server.service.get(match["login"], match["asset"])
+                except KeyError:
+                    self._reply(404, b"Unknown repository\n", "text/plain; charset=utf-8")
+                    return
+                except Exception as exc:
+                    self._reply(502, f"GitHub fetch failed: {exc}\n".encode("utf-8"), "text/plain; charset=utf-8")
+                    return
+
+                headers = {"ETag": etag, "Cache-Control": cache_control}
+                if etag in (self.headers.get("If-None-Match") or "").replace(" ", "").split(","):
+                    self._reply(304, b"", None, headers)
+                else:
+                    self._reply(200, body, "image/svg+xml; charset=utf-8", headers)
+
+            def _reply(self, status: int, body: bytes, content_type: str | None, headers: dict[str, str] | None = None) -> None:
+                self.send_response(status)
+                if content_type:
+                    self.send_header("Content-Type", content_type)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> ProfileServer:
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.service.close()
+
+    def __enter__(self) -> ProfileServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve GitHub profile SVGs on demand.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--ttl", type=float, default=600, help="Seconds a fetched profile is served as fresh.")
+    parser.add_argument(
+        "--stale-ttl",
+        type=float,
+        default=86400,
+        help="Further seconds a profile is served while it refreshes in the background.",
+    )
+    parser.add_argument("--max-logins", type=int, default=256, help="Profiles kept in memory (least recently used go first).")
+    parser.add_argument("--replay", type=Path, metavar="CASSETTE", help="Answer GraphQL queries from this file offline.")
+    args = parser.parse_args(argv)
+
+    if args.replay:
+        transport: gpa.GraphQLTransport = gpa.ReplayTransport(args.replay)
+    else:
+        transport = gpa.GraphQLTransport(gpa._require_env("GITHUB_TOKEN"), pool_size=32)
+
+    service = ProfileService(
+        transport,
+        ttl=args.ttl,
+        stale_ttl=args.stale_ttl,
+        max_logins=args.max_logins,
+        commit_days=int(os.getenv("PERIOD_DAYS", "365")),
+        period_label=os.getenv("PERIOD_LABEL") or "últimos 12 meses",
+    )
+    server = ProfileServer(service, host=args.host, port=args.port)
+    print(f"🌐 Serving profile SVGs on {server.url}/<login>/overview.svg")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+        service.close()
+        transport.close()
+
+
+if __name__ == "__main__":
+    main()